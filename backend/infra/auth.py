@@ -16,12 +16,27 @@ class AuthManager:
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     DATA_DIR = os.path.join(os.path.expanduser("~"), ".nano_agent_team")
     AUTH_FILE = os.path.join(DATA_DIR, "auth.json")
+
+    # Bumped on every in-process write; see revision()
+    _revision = 0
     
     @classmethod
     def _ensure_dir(cls):
         if not os.path.exists(cls.DATA_DIR):
             os.makedirs(cls.DATA_DIR, mode=0o700, exist_ok=True)
             
+    @classmethod
+    def revision(cls) -> tuple:
+        """
+        Cheap change marker for cached lookups.
+        Combines in-process writes with auth file mtime (writes by other processes).
+        """
+        try:
+            mtime = os.stat(cls.AUTH_FILE).st_mtime_ns
+        except OSError:
+            mtime = 0
+        return cls._revision, mtime
+
     @classmethod
     def all(cls) -> Dict[str, Any]:
         """
@@ -51,6 +66,7 @@ class AuthManager:
         Enforces 0o600 permissions on the file.
         """
         cls._ensure_dir()
+        cls._revision += 1
         
         data = cls.all()
         data[provider_id] = info
@@ -77,6 +93,7 @@ class AuthManager:
         data = cls.all()
         if provider_id in data:
             del data[provider_id]
+            cls._revision += 1
             
             try:
                 temp_file = cls.AUTH_FILE + ".tmp"
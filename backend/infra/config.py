@@ -7,6 +7,7 @@ Includes core LLM, path, and external service configurations.
 
 import os
 import json
+import functools
 from typing import Dict, Any, Optional
 from backend.infra.provider_registry import ProviderRegistry
 from backend.infra.auth import AuthManager
@@ -34,6 +35,7 @@ class Config:
     LOG_DIR = os.path.join(BASE_DIR, "logs")
     AGENTS_DIR = os.path.join(BASE_DIR, "backend", "agents")
     SKILLS_DIR = os.path.join(BASE_DIR, ".skills")
+    CACHE_DIR = os.path.join(BASE_DIR, ".cache")
     
     # Log File Path
     LOG_PATH = os.path.join(LOG_DIR, "app.log")
@@ -53,6 +55,9 @@ class Config:
     SEARCH_PROVIDER = "exa"
     JINA_READER_KEY = ""
 
+    # Bumped whenever provider config changes, so callers can memoize lookups
+    revision = 0
+
     @classmethod
     def load_settings(cls):
         """Load settings.json"""
@@ -92,6 +97,7 @@ class Config:
             try:
                 with open(cls._llm_config_path, 'r', encoding='utf-8') as f:
                     cls._llm_config = json.load(f)
+                cls.revision += 1
                 
                 # active_model is now handled by StateManager (tui_state.json)
                 return cls._llm_config
@@ -139,6 +145,7 @@ class Config:
             cls._llm_config = {
                 "providers": new_providers
             }
+            cls.revision += 1
             
             if default_model:
                 if "/" in default_model:
@@ -154,6 +161,8 @@ class Config:
     @classmethod
     def save_llm_config(cls):
         """Save current LLM config to file."""
+        # All in-memory provider/model mutations go through here
+        cls.revision += 1
         try:
             with open(cls._llm_config_path, 'w', encoding='utf-8') as f:
                 json.dump(cls._llm_config, f, indent=2)
@@ -246,6 +255,18 @@ class Config:
             
         # Keys for providers are handled by AuthManager + Env lookup in get_provider_config
 
+    @classmethod
+    def get_cached_provider_config(cls, model_id: str) -> Dict[str, Any]:
+        """
+        Memoized get_provider_config
+
+        get_provider_config re-reads auth.json on every call; results are cached
+        until the provider config or stored credentials change (env-var keys are read
+        on first lookup). Treat the returned dict as read-only.
+        """
+        cls._ensure_initialized()
+        return _cached_provider_config(model_id, cls.revision, AuthManager.revision())
+
     @classmethod
     def get_provider_config(cls, model_id: str) -> Dict[str, Any]:
         """
@@ -401,4 +422,9 @@ class Config:
             ]
             cls.save_llm_config()
 
+@functools.lru_cache(maxsize=32)
+def _cached_provider_config(model_id: Optional[str], config_rev: int, auth_rev: tuple) -> Dict[str, Any]:
+    # Revisions are part of the key so edits invalidate without explicit cache_clear()
+    return Config.get_provider_config(model_id)
+
 # Lazy initialization: Config.initialize() is called on first access via _ensure_initialized()
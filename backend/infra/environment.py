@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 
 class EnvironmentError(Exception):
@@ -85,6 +85,55 @@ class Environment(ABC):
         """
         pass
     
+    def replace_unique(self, path: str, old: str, new: str) -> int:
+        """
+        Replace a string in a file, only if it occurs exactly once.
+
+        Args:
+            path: Absolute or relative path to the file.
+            old: Non-empty string to find.
+            new: Replacement string.
+
+        Returns:
+            Number of non-overlapping occurrences of *old*; the file is
+            rewritten only when this is 1 and *new* differs from *old*.
+
+        Raises:
+            PermissionError: If the write is denied by security policy.
+            EnvironmentError: If reading or writing fails.
+        """
+        content = self.read_file(path)
+        idx = content.find(old)
+        if idx < 0:
+            return 0
+        # Uniqueness check stops at the second hit instead of counting to EOF
+        end = idx + len(old)
+        if content.find(old, end) >= 0:
+            return content.count(old)
+        if new != old: # No-op edits skip the write
+            self.write_file(path, content[:idx] + new + content[end:])
+        return 1
+
+    def stat(self, path: str) -> Optional[Tuple[int, int]]:
+        """
+        Cheap change validator for a file.
+
+        Returns:
+            (size_in_bytes, mtime_ns), or None when the environment cannot
+            provide it without transferring the file (the default).
+        """
+        return None
+
+    def local_path(self, path: str) -> Optional[str]:
+        """
+        Host filesystem path of a file, when the environment shares it.
+
+        Returns:
+            A path the caller may open directly (read-only), or None when the
+            file must go through download_file (the default).
+        """
+        return None
+
     @abstractmethod
     def file_exists(self, path: str) -> bool:
         """Check if a file exists."""
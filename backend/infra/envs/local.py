@@ -1,11 +1,15 @@
 import os
+import mmap
 import subprocess
 import shutil
 import shlex
 import sys
-from typing import Optional, Dict, List, Callable
+from typing import Optional, Dict, List, Callable, Tuple
 from backend.infra.environment import Environment, FileNotFoundError as EnvFileNotFoundError, PermissionError as EnvPermissionError, EnvironmentError as EnvError, CommandError
 
+# Files at least this large are edited through mmap instead of a full str decode
+MMAP_EDIT_MIN_SIZE = 1 << 20
+
 class LocalEnvironment(Environment):
     """
     Local environment implementation using subprocess and os.
@@ -171,6 +175,18 @@ class LocalEnvironment(Environment):
         2. If 'allowed_write_paths' is configured (e.g., for restricted subagents), 
            writes outside these paths are automatically denied without prompt.
         """
+        abs_path = self._check_write_allowed(path)
+
+        try:
+            os.makedirs(os.path.dirname(abs_path), exist_ok=True)
+            with open(abs_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            return f"Successfully wrote to file '{path}'."
+        except Exception as e:
+            raise EnvError(f"Error writing file '{path}': {e}")
+
+    def _check_write_allowed(self, path: str) -> str:
+        """Apply the write security policy to *path*; returns its absolute path."""
         # Security Check for Write
         abs_path = os.path.abspath(path)
         if not abs_path.startswith(self.sandbox_root):
@@ -196,14 +212,67 @@ class LocalEnvironment(Environment):
                     break
             if not is_allowed:
                  raise EnvPermissionError(f"Write denied. This agent is restricted to writing only in: {self.allowed_write_paths}")
+        return abs_path
 
+    def replace_unique(self, path: str, old: str, new: str) -> int:
+        """
+        Large files are searched as bytes through mmap (UTF-8 matches are
+        byte matches) and rewritten around the hit, skipping the full decode.
+        """
         try:
-            os.makedirs(os.path.dirname(abs_path), exist_ok=True)
-            with open(abs_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return f"Successfully wrote to file '{path}'."
-        except Exception as e:
-            raise EnvError(f"Error writing file '{path}': {e}")
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        if size < MMAP_EDIT_MIN_SIZE:
+            return super().replace_unique(path, old, new)
+
+        old_b = old.encode('utf-8')
+        tmp_path = None
+        try:
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Text-mode reads translate CRLF; leave such files to the str path
+                use_text = mm.find(b'\r') >= 0
+                if not use_text:
+                    idx = mm.find(old_b)
+                    if idx < 0:
+                        return 0
+                    end = idx + len(old_b)
+                    if mm.find(old_b, end) >= 0:
+                        return _mmap_count(mm, old_b)
+                    if new == old:
+                        return 1
+                    abs_path = os.path.realpath(self._check_write_allowed(path))
+                    tmp_path = f"{abs_path}.{os.getpid()}.tmp"
+                    with open(tmp_path, 'wb') as out, memoryview(mm) as view:
+                        out.write(view[:idx])
+                        out.write(new.encode('utf-8'))
+                        out.write(view[end:])
+            if use_text:
+                return super().replace_unique(path, old, new)
+            # Swap in atomically, after unmapping (Windows can't replace a mapped file)
+            shutil.copymode(abs_path, tmp_path)
+            os.replace(tmp_path, abs_path)
+            tmp_path = None
+            return 1
+        except OSError as e:
+            raise EnvError(f"Error editing file '{path}': {e}")
+        finally:
+            if tmp_path:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def stat(self, path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def local_path(self, path: str) -> Optional[str]:
+        # Same filesystem: callers can read the file in place instead of copying it
+        return path if os.path.isfile(path) else None
 
     def file_exists(self, path: str) -> bool:
         return os.path.exists(path)
@@ -293,3 +362,14 @@ class LocalEnvironment(Environment):
              
              if os.path.exists(guard_path):
                  env["PYTHONSTARTUP"] = guard_path
+
+
+def _mmap_count(mm: mmap.mmap, needle: bytes) -> int:
+    """Non-overlapping occurrence count, like str.count."""
+    count, pos = 0, 0
+    while True:
+        pos = mm.find(needle, pos)
+        if pos < 0:
+            return count
+        count += 1
+        pos += len(needle)
@@ -186,11 +186,8 @@ class AgentEngine:
             try:
                 from backend.tools.activate_skill import ActivateSkillTool
                 if not any(t.name == "activate_skill" for t in current_tools):
+                    # Description lists the registry's skills (rendered by the tool itself)
                     active_skill_tool = ActivateSkillTool(self.skill_registry)
-                    # Dynamically update description with available skills
-                    skills_meta = self.skill_registry.get_skills_metadata()
-                    skills_list_str = ", ".join([f"'{s['name']}'" for s in skills_meta])
-                    active_skill_tool._description = active_skill_tool.description.format(skills_list=skills_list_str)
                     current_tools.append(active_skill_tool)
             except ImportError:
                 Logger.warning("ActivateSkillTool not found, skill-on-demand disabled.")
@@ -496,14 +493,14 @@ class AgentEngine:
 
         # 1. 准备子代理配置
         # 子代理继承当前的 provider_key 或者是默认的，除非 agent_data 指定了 modal
-        provider_key = agent_data.get("model") or self.provider_key 
+        provider_key = agent_data.model or self.provider_key 
         
         # 2. 准备子代理工具
         # 使用 tool_registry 为子代理创建工具实例。
         # 如果子代理定义了 "allowed_tools"，则只实例化指定的工具。
         resolved_tools = []
-        if self.tool_registry and "allowed_tools" in agent_data:
-             for name in agent_data["allowed_tools"]:
+        if self.tool_registry:
+             for name in agent_data.allowed_tools:
                  # 注意：这里创建的工具需要具备执行环境 (Context)。
                  # 目前依赖于 ToolRegistry 在 create_tool 时可能需要的 context。
                  # 对于某些依赖环境的工具（如 BashTool），后续可能需要优化环境注入机制，
@@ -517,7 +514,7 @@ class AgentEngine:
         # 未来应在 Engine 初始化时接收 tool_context，并在此处传递给 create_tool，
         # 或者在 SystemPromptConfig 中携带更多环境信息。
         
-        config = SystemPromptConfig(base_prompt=agent_data["instructions"])
+        config = SystemPromptConfig(base_prompt=agent_data.instructions)
         
         messages = history or []
         messages.append({"role": "user", "content": query})
@@ -6,7 +6,10 @@ Provides unified interface for LLM client creation, abstracting differences betw
 
 import os
 import json
-import uuid
+import secrets
+import importlib.util
+import itertools
+import functools
 from dataclasses import dataclass, field
 from typing import Optional, TYPE_CHECKING, List
 
@@ -20,75 +23,146 @@ except ImportError:
     HAS_OPENAI = False
     OpenAI = None  # type: ignore
 
-# Try to import Langfuse OpenAI wrapper only if not disabled
-LangfuseOpenAI = None
-if os.environ.get("DISABLE_LANGFUSE", "").lower() != "true":
+DISABLE_LANGFUSE = os.environ.get("DISABLE_LANGFUSE", "").lower() == "true"
+
+def _has_module(name: str) -> bool:
     try:
-        from langfuse.openai import OpenAI as LangfuseOpenAI
-    except ImportError:
-        LangfuseOpenAI = None
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
 
-try:
-    import anthropic
-    HAS_ANTHROPIC = True
-except ImportError:
-    HAS_ANTHROPIC = False
+# Heavy optional SDKs are only probed here; they are imported when first used
+HAS_LANGFUSE = not DISABLE_LANGFUSE and _has_module("langfuse")
+HAS_ANTHROPIC = _has_module("anthropic")
+HAS_GOOGLE = _has_module("google.generativeai")
 
 try:
-    import google.generativeai as genai
-    HAS_GOOGLE = True
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    HAS_GOOGLE = False
+    HAS_ORJSON = False
+
+# Tool-call arguments are (de)serialized on every turn; prefer the native codec
+if HAS_ORJSON:
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+else:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
 
 # --- Mock Response Classes for Adapter Compatibility ---
 
-@dataclass
+@dataclass(slots=True)
+class MockFunction:
+    name: str = ""
+    arguments: str = ""
+
+@dataclass(slots=True)
 class MockToolCall:
     id: str
-    function: object
+    function: MockFunction
 
-@dataclass
+@dataclass(slots=True)
 class MockMessage:
     content: str = ""
     tool_calls: Optional[List[MockToolCall]] = None
 
-@dataclass
+@dataclass(slots=True)
 class MockChoice:
     message: MockMessage
 
-@dataclass
+@dataclass(slots=True)
 class MockResponse:
     choices: List[MockChoice] = field(default_factory=list)
 
 # --- Anthropic Adapter Classes ---
 
-class OpenAIStyleChunk:
-    """Mock OpenAI chunk for compatibility."""
-    def __init__(self, content=None, tool_calls=None):
-        self.choices = [self.Choice(content, tool_calls)]
-
-    class Choice:
-        def __init__(self, content, tool_calls):
-            self.delta = self.Delta(content, tool_calls)
-
-        class Delta:
-            def __init__(self, content, tool_calls):
-                self.content = content
-                self.tool_calls = [
-                    self.ToolCall(i, tc.get("id"), tc.get("function", {}))
-                    for i, tc in enumerate(tool_calls)
-                ] if tool_calls else None
+@dataclass(slots=True)
+class ChunkFunction:
+    name: Optional[str] = None
+    arguments: Optional[str] = None
 
-            class ToolCall:
-                def __init__(self, index, id, function):
-                    self.index = index
-                    self.id = id
-                    self.function = self.Function(function.get("name"), function.get("arguments"))
+@dataclass(slots=True)
+class ChunkToolCall:
+    index: int
+    id: Optional[str] = None
+    function: Optional[ChunkFunction] = None
 
-                class Function:
-                    def __init__(self, name, arguments):
-                        self.name = name
-                        self.arguments = arguments
+@dataclass(slots=True)
+class ChunkDelta:
+    content: Optional[str] = None
+    tool_calls: Optional[List[ChunkToolCall]] = None
+
+@dataclass(slots=True)
+class ChunkChoice:
+    delta: ChunkDelta
+
+@dataclass(slots=True)
+class OpenAIStyleChunk:
+    """Mock OpenAI chunk for compatibility."""
+    choices: List[ChunkChoice]
+
+    @classmethod
+    def text(cls, content: str) -> "OpenAIStyleChunk":
+        return cls([ChunkChoice(ChunkDelta(content=content))])
+
+    @classmethod
+    def tool_call(cls, index: int, id: Optional[str] = None, name: Optional[str] = None,
+                  arguments: Optional[str] = None) -> "OpenAIStyleChunk":
+        tool_call = ChunkToolCall(index=index, id=id, function=ChunkFunction(name, arguments))
+        return cls([ChunkChoice(ChunkDelta(tool_calls=[tool_call]))])
+
+def _plain_to_anthropic(m: dict) -> dict:
+    # Anthropic doesn't allow 'name' in messages
+    return {"role": m["role"], "content": m["content"]}
+
+def _tool_to_anthropic(m: dict) -> dict:
+    # Convert tool result to Anthropic format
+    # Anthropic expects tool results in a specific message role 'user' with content as list
+    # This adapter V2 will handle complex tool history mapping later if needed
+    # For now, simplistic mapping:
+    return {
+        "role": "user",
+        "content": [
+            {
+                "type": "tool_result",
+                "tool_use_id": m.get("tool_call_id"),
+                "content": m.get("content")
+            }
+        ]
+    }
+
+def _assistant_to_anthropic(m: dict) -> dict:
+    # Anthropic assistant messages with tool calls need special handling
+    if not m.get("tool_calls"):
+        return _plain_to_anthropic(m)
+    content_blocks = []
+    if m["content"]:
+        content_blocks.append({"type": "text", "text": m["content"]})
+    for tc in m["tool_calls"]:
+        arguments = tc["function"]["arguments"]
+        content_blocks.append({
+            "type": "tool_use",
+            "id": tc["id"],
+            "name": tc["function"]["name"],
+            "input": _json_loads(arguments) if isinstance(arguments, str) else arguments
+        })
+    return {"role": "assistant", "content": content_blocks}
+
+# Role -> converter for OpenAI-style history messages ('system' is extracted separately)
+_ANTHROPIC_CONVERTERS = {
+    "tool": _tool_to_anthropic,
+    "assistant": _assistant_to_anthropic,
+}
+
+def _to_anthropic_tool(fn: dict) -> dict:
+    return {
+        "name": fn.get("name"),
+        "description": fn.get("description"),
+        "input_schema": fn.get("parameters")
+    }
 
 class AnthropicAdapter:
     """
@@ -96,6 +170,7 @@ class AnthropicAdapter:
     Specifically converts chat.completions.create calls to messages.create.
     """
     def __init__(self, api_key: str, base_url: str = None, timeout: float = 60.0):
+        import anthropic
         self.client = anthropic.Anthropic(
             api_key=api_key,
             base_url=base_url,
@@ -116,56 +191,18 @@ class AnthropicAdapter:
                 system_prompt = None
                 filtered_messages = []
                 for m in messages:
-                    if m["role"] == "system":
+                    role = m["role"]
+                    if role == "system":
                         system_prompt = m["content"]
-                    elif m["role"] == "tool":
-                        # Convert tool result to Anthropic format
-                        # Content block type 'tool_result'
-                        # Anthropic expects tool results in a specific message role 'user' with content as list
-                        # This adapter V2 will handle complex tool history mapping later if needed
-                        # For now, simplistic mapping:
-                        filtered_messages.append({
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "tool_result",
-                                    "tool_use_id": m.get("tool_call_id"),
-                                    "content": m.get("content")
-                                }
-                            ]
-                        })
-                    else:
-                        role = m["role"]
-                        content = m["content"]
-                        # Anthropic assistant messages with tool calls need special handling
-                        if role == "assistant" and m.get("tool_calls"):
-                            content_blocks = []
-                            if content:
-                                content_blocks.append({"type": "text", "text": content})
-                            for tc in m["tool_calls"]:
-                                content_blocks.append({
-                                    "type": "tool_use",
-                                    "id": tc["id"],
-                                    "name": tc["function"]["name"],
-                                    "input": json.loads(tc["function"]["arguments"]) if isinstance(tc["function"]["arguments"], str) else tc["function"]["arguments"]
-                                })
-                            filtered_messages.append({"role": "assistant", "content": content_blocks})
-                        else:
-                            # Anthropic doesn't allow 'name' in messages
-                            msg = {"role": role, "content": content}
-                            filtered_messages.append(msg)
+                        continue
+                    convert = _ANTHROPIC_CONVERTERS.get(role, _plain_to_anthropic)
+                    filtered_messages.append(convert(m))
 
                 # 2. Prepare Tool Config (if any)
-                anthropic_tools = []
-                if tools:
-                    for t in tools:
-                        if t.get("type") == "function":
-                            fn = t.get("function", {})
-                            anthropic_tools.append({
-                                "name": fn.get("name"),
-                                "description": fn.get("description"),
-                                "input_schema": fn.get("parameters")
-                            })
+                anthropic_tools = [
+                    _to_anthropic_tool(t.get("function", {}))
+                    for t in tools if t.get("type") == "function"
+                ] if tools else []
 
                 # 3. Call Anthropic API
                 api_kwargs = {
@@ -197,7 +234,7 @@ class AnthropicAdapter:
                             "id": block.id,
                             "function": {
                                 "name": block.name,
-                                "arguments": json.dumps(block.input)
+                                "arguments": _json_dumps(block.input)
                             }
                         })
 
@@ -205,7 +242,7 @@ class AnthropicAdapter:
                 mock_tool_calls = [
                     MockToolCall(
                         id=tc["id"],
-                        function=type('obj', (object,), tc["function"])
+                        function=MockFunction(name=tc["function"]["name"], arguments=tc["function"]["arguments"])
                     ) for tc in tool_calls
                 ] if tool_calls else None
 
@@ -214,33 +251,66 @@ class AnthropicAdapter:
                 return MockResponse(choices=[mock_choice])
 
             def _stream_response(self, api_kwargs):
+                # Dense index of the current tool_use block; Anthropic's own block
+                # index also counts text blocks, while consumers expect 0, 1, 2...
+                tool_idx = -1
                 with self.client.messages.stream(**api_kwargs) as stream:
                     for event in stream:
                         if event.type == "content_block_delta":
                             if event.delta.type == "text_delta":
-                                yield OpenAIStyleChunk(content=event.delta.text)
+                                yield OpenAIStyleChunk.text(event.delta.text)
                             elif event.delta.type == "input_json_delta":
                                 # Handle streaming tool call arguments
                                 # Note: Anthropic gives us the ID in content_block_start
-                                # We need to track current tool call index
-                                yield OpenAIStyleChunk(tool_calls=[{
-                                    "index": 0, # Simplified: support one tool call for now or track index
-                                    "function": {"arguments": event.delta.partial_json}
-                                }])
+                                yield OpenAIStyleChunk.tool_call(max(tool_idx, 0), arguments=event.delta.partial_json)
                         elif event.type == "content_block_start":
                             if event.content_block.type == "tool_use":
-                                yield OpenAIStyleChunk(tool_calls=[{
-                                    "index": 0,
-                                    "id": event.content_block.id,
-                                    "function": {"name": event.content_block.name, "arguments": ""}
-                                }])
+                                tool_idx += 1
+                                yield OpenAIStyleChunk.tool_call(
+                                    tool_idx,
+                                    id=event.content_block.id,
+                                    name=event.content_block.name,
+                                    arguments=""
+                                )
+
+_gemini_configured_key: Optional[str] = None
+
+# Tool-call IDs are internal correlation IDs: a per-process prefix (pid + random
+# salt, so restarts with a recycled pid don't collide) plus an atomic counter.
+_CALL_ID_PREFIX = f"call_{os.getpid():x}{secrets.token_hex(3)}_"
+_call_counter = itertools.count()
+
+def _next_call_id() -> str:
+    return f"{_CALL_ID_PREFIX}{next(_call_counter):x}"
+
+@functools.lru_cache(maxsize=32)
+def _get_gemini_model(model: str, system_instruction: Optional[str], tools_json: Optional[str]):
+    """
+    Build GenerativeModel (memoized)
+
+    Construction re-parses tool schemas into protobuf descriptors, so models are
+    reused across turns while model, system prompt and tool set are unchanged.
+    """
+    import google.generativeai as genai
+    return genai.GenerativeModel(
+        model_name=model,
+        system_instruction=system_instruction,
+        tools=[_json_loads(tools_json)] if tools_json else [] # Gemini SDK expects a list of list of functions or a Tool object
+    )
 
 class GeminiAdapter:
     """
     Adapter for Google Gemini API via google-generativeai SDK.
     """
     def __init__(self, api_key: str, base_url: str = None, timeout: float = 60.0):
-        genai.configure(api_key=api_key)
+        global _gemini_configured_key
+        import google.generativeai as genai
+        # genai.configure is process-global; skip it when the key is unchanged
+        if api_key != _gemini_configured_key:
+            genai.configure(api_key=api_key)
+            _gemini_configured_key = api_key
+            # Memoized models may hold a client bound to the previous key
+            _get_gemini_model.cache_clear()
         self.chat = self.Chat()
 
     class Chat:
@@ -249,10 +319,14 @@ class GeminiAdapter:
 
         class Completions:
             def create(self, model: str, messages: list, stream: bool = False, tools: list = None, **kwargs):
+                import google.generativeai as genai
+
                 # 1. Separate System Prompt and History
                 system_instruction = None
                 history = []
                 last_user_message = None
+                # Source role of the last history entry ('user' vs 'tool' both map to Gemini 'user')
+                last_role = None
 
                 # Gemini roles: "user", "model"
                 for m in messages:
@@ -260,7 +334,10 @@ class GeminiAdapter:
                     content = m["content"]
                     if role == "system":
                         system_instruction = content
-                    elif role == "user":
+                        continue
+                    if role in ("user", "assistant", "tool"):
+                        last_role = role
+                    if role == "user":
                         history.append({"role": "user", "parts": [content]})
                     elif role == "assistant":
                         if m.get("tool_calls"):
@@ -273,7 +350,7 @@ class GeminiAdapter:
                                     tool_call=genai.protos.ToolCall(
                                         function_call=genai.protos.FunctionCall(
                                             name=tc["function"]["name"],
-                                            args=json.loads(tc["function"]["arguments"]) if isinstance(tc["function"]["arguments"], str) else tc["function"]["arguments"]
+                                            args=_json_loads(tc["function"]["arguments"]) if isinstance(tc["function"]["arguments"], str) else tc["function"]["arguments"]
                                         )
                                     )
                                 ))
@@ -295,27 +372,19 @@ class GeminiAdapter:
                             ]
                         })
 
-                # The last message should be extracted if it's user
-                if history and history[-1]["role"] == "user" and not any(isinstance(p, genai.protos.Part) and (p.function_response) for p in history[-1]["parts"]):
+                # The last message should be extracted if it's user (not a tool result)
+                if history and last_role == "user":
                     last_user_message_dict = history.pop()
                     last_user_message = last_user_message_dict["parts"][0]
                 
                 # 2. Initialize Model
-                gemini_tools = []
+                tools_json = None
                 if tools:
-                    functions = []
-                    for t in tools:
-                        if t.get("type") == "function":
-                            fn = t.get("function", {})
-                            functions.append(fn)
+                    functions = [t.get("function", {}) for t in tools if t.get("type") == "function"]
                     if functions:
-                        gemini_tools = [functions] # Gemini SDK expects a list of list of functions or a Tool object
+                        tools_json = _json_dumps(functions)
 
-                gen_model = genai.GenerativeModel(
-                    model_name=model,
-                    system_instruction=system_instruction,
-                    tools=gemini_tools
-                )
+                gen_model = _get_gemini_model(model, system_instruction, tools_json)
 
                 # 3. Start Chat
                 chat_session = gen_model.start_chat(history=history)
@@ -335,10 +404,10 @@ class GeminiAdapter:
                         content += part.text
                     if part.function_call:
                         tool_calls.append({
-                            "id": f"call_{uuid.uuid4().hex[:12]}",
+                            "id": _next_call_id(),
                             "function": {
                                 "name": part.function_call.name,
-                                "arguments": json.dumps(dict(part.function_call.args))
+                                "arguments": _json_dumps(dict(part.function_call.args))
                             }
                         })
 
@@ -346,7 +415,7 @@ class GeminiAdapter:
                 mock_tool_calls = [
                     MockToolCall(
                         id=tc["id"],
-                        function=type('obj', (object,), tc["function"])
+                        function=MockFunction(name=tc["function"]["name"], arguments=tc["function"]["arguments"])
                     ) for tc in tool_calls
                 ] if tool_calls else None
 
@@ -362,16 +431,14 @@ class GeminiAdapter:
                         # Check for tool calls
                         for part in chunk.candidates[0].content.parts:
                             if part.text:
-                                yield OpenAIStyleChunk(content=part.text)
+                                yield OpenAIStyleChunk.text(part.text)
                             if part.function_call:
-                                yield OpenAIStyleChunk(tool_calls=[{
-                                    "index": 0,
-                                    "id": f"call_{uuid.uuid4().hex[:12]}",
-                                    "function": {
-                                        "name": part.function_call.name,
-                                        "arguments": json.dumps(dict(part.function_call.args))
-                                    }
-                                }])
+                                yield OpenAIStyleChunk.tool_call(
+                                    0,
+                                    id=_next_call_id(),
+                                    name=part.function_call.name,
+                                    arguments=_json_dumps(dict(part.function_call.args))
+                                )
                     except (ValueError, IndexError, AttributeError):
                         pass # Blocked or empty chunk
 
@@ -380,6 +447,16 @@ from backend.infra.config import Config
 from backend.utils.logger import Logger
 
 
+def _resolve_key(provider_key: Optional[str]) -> Optional[str]:
+    """Resolve provider key, falling back to the active provider/model"""
+    if provider_key:
+        return provider_key
+    Config._ensure_initialized()
+    if Config.ACTIVE_PROVIDER and Config.ACTIVE_MODEL:
+        return f"{Config.ACTIVE_PROVIDER}/{Config.ACTIVE_MODEL}"
+    return provider_key
+
+
 class LLMFactory:
     """
     LLM Client Factory
@@ -392,12 +469,8 @@ class LLMFactory:
         """
         Create LLM Client
         """
-        key = provider_key
-        if not key:
-            if Config.ACTIVE_PROVIDER and Config.ACTIVE_MODEL:
-                key = f"{Config.ACTIVE_PROVIDER}/{Config.ACTIVE_MODEL}"
-        
-        llm_config = Config.get_provider_config(key)
+        key = _resolve_key(provider_key)
+        llm_config = Config.get_cached_provider_config(key)
         
         api_key = llm_config.get("api_key")
         base_url = llm_config.get("base_url")
@@ -406,15 +479,27 @@ class LLMFactory:
             Logger.error(f"LLM API Key missing for provider '{key}'")
             return None
         
-        # Debug log: Masked key
-        masked_key = f"{api_key[:6]}...{api_key[-4:]}" if len(api_key) > 10 else "***"
-        print(f"[LLM] Creating client for provider: {key}, model: {llm_config.get('model')}, base_url: {base_url}, key: {masked_key}")
-
         # Langfuse keys (from Config first, fallback env). Only enable when both exist and not disabled.
         lf_public = Config.LANGFUSE_PUBLIC_KEY or os.environ.get("LANGFUSE_PUBLIC_KEY", "")
         lf_secret = Config.LANGFUSE_SECRET_KEY or os.environ.get("LANGFUSE_SECRET_KEY", "")
-        disable_lf = os.environ.get("DISABLE_LANGFUSE", "").lower() == "true"
-        
+        use_langfuse = bool(HAS_LANGFUSE and lf_public and lf_secret)
+
+        return LLMFactory._build_client(key, api_key, base_url, use_langfuse)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def _build_client(key: str, api_key: str, base_url: Optional[str], use_langfuse: bool):
+        """
+        Construct SDK client (memoized)
+
+        Clients are cached by resolved credentials, so repeated engines for the
+        same provider reuse one HTTP connection pool, while a changed key or
+        base_url still yields a fresh client.
+        """
+        # Debug log: Masked key
+        masked_key = f"{api_key[:6]}...{api_key[-4:]}" if len(api_key) > 10 else "***"
+        print(f"[LLM] Creating client for provider: {key}, base_url: {base_url}, key: {masked_key}")
+
         # Set reasonable timeout (60s) to prevent network fluctuation timeout
         if key == "anthropic":
             if not HAS_ANTHROPIC:
@@ -428,8 +513,12 @@ class LLMFactory:
                 return None
             return GeminiAdapter(api_key=api_key, base_url=base_url, timeout=60.0)
 
-        if not disable_lf and lf_public and lf_secret and LangfuseOpenAI:
-            return LangfuseOpenAI(api_key=api_key, base_url=base_url, timeout=60.0)
+        if use_langfuse:
+            try:
+                from langfuse.openai import OpenAI as LangfuseOpenAI
+                return LangfuseOpenAI(api_key=api_key, base_url=base_url, timeout=60.0)
+            except ImportError as e:
+                Logger.warning(f"Langfuse OpenAI wrapper unavailable, using plain client: {e}")
         
         return OpenAI(api_key=api_key, base_url=base_url, timeout=60.0)
 
@@ -438,11 +527,6 @@ class LLMFactory:
         """
         Get model name
         """
-        key = provider_key
-        if not key:
-            if Config.ACTIVE_PROVIDER and Config.ACTIVE_MODEL:
-                key = f"{Config.ACTIVE_PROVIDER}/{Config.ACTIVE_MODEL}"
-        
-        llm_config = Config.get_provider_config(key)
+        llm_config = Config.get_cached_provider_config(_resolve_key(provider_key))
         return llm_config.get("model", "none")
 
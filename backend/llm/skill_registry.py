@@ -7,63 +7,165 @@ Skills differ from subagents; they are "action guides" injected at task start to
 """
 
 import os
-import yaml
-from typing import List, Dict, Any, Optional
+import re
+import string
+import functools
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple, Union
 from backend.utils.logger import Logger
 
+# Punctuation -> space table (ASCII minus '_', plus common CJK punctuation)
+_PUNCT_TRANS = str.maketrans(
+    {c: " " for c in string.punctuation.replace("_", "") + "，。、；：！？（）【】《》“”‘’"}
+)
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split text into lowercase keywords (len > 2) used for skill matching"""
+    return [w for w in text.lower().translate(_PUNCT_TRANS).split() if len(w) > 2]
+
+
+_META_LINE = re.compile(r"^([A-Za-z_][\w-]*):(?:\s+(.*))?$")
+# Plain scalars YAML would not load as str, or syntax the line parser does not handle
+_YAML_SPECIAL = re.compile(
+    r"^(?:[-+]?[\d.]|true$|false$|yes$|no$|on$|off$|null$|~$|[|>{&*!%@`-])", re.IGNORECASE
+)
+
+
+def _parse_scalar(value: str) -> Optional[str]:
+    """Parse a single-line YAML scalar; None means it needs the full YAML loader"""
+    if value[:1] in ("'", '"'):
+        quote = value[0]
+        if len(value) < 2 or value[-1] != quote or quote in value[1:-1] or "\\" in value:
+            return None
+        return value[1:-1]
+    if _YAML_SPECIAL.match(value) or ": " in value or " #" in value or value.endswith(":"):
+        return None
+    return value
+
+
+def _parse_frontmatter(text: str) -> Dict[str, Any]:
+    """
+    Parse SKILL.md frontmatter
+
+    SKILL.md headers are flat `key: value` maps (optionally with inline
+    `[a, b]` lists), which are handled by a small line parser. Anything
+    richer falls back to PyYAML, imported only when actually needed.
+    """
+    meta: Dict[str, Any] = {}
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        match = _META_LINE.match(line.rstrip())
+        if not match or not match.group(2):
+            break
+        key, value = match.group(1), match.group(2).strip()
+        if value.startswith("["):
+            if not value.endswith("]") or any(c in value[1:-1] for c in "[]{}\"'"):
+                break
+            items = [_parse_scalar(v.strip()) for v in value[1:-1].split(",") if v.strip()]
+            if None in items:
+                break
+            meta[key] = items
+        else:
+            parsed = _parse_scalar(value)
+            if parsed is None:
+                break
+            meta[key] = parsed
+    else:
+        return meta
+
+    import yaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(text, Loader=loader) or {}
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_skill_md(path: str, mtime_ns: int, size: int) -> Tuple[str, str, str, Optional[List[str]]]:
+    """
+    Parse SKILL.md into (name, description, instructions, allowed_tools).
+
+    mtime_ns and size are only used as cache keys, so an unchanged file
+    is never re-read or re-parsed within the same process.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    name, description, instructions, allowed_tools = "", "", "", None
+    # Frontmatter: ---<header>---<body>; locate delimiters on raw bytes, decode each part once
+    if data.startswith(b"---"):
+        end = data.find(b"---", 3)
+        if end != -1:
+            meta = _parse_frontmatter(data[3:end].decode("utf-8"))
+            name = meta.get("name", os.path.basename(os.path.dirname(path)))
+            description = meta.get("description", "")
+            allowed_tools = meta.get("allowed-tools")
+            instructions = data[end + 3:].decode("utf-8").strip()
+    return name, description, instructions, allowed_tools
+
 class Skill:
     """
     Skill Definition Class
     
     Represents a skill folder containing SKILL.md instruction file and optional resources.
     """
-    def __init__(self, path: str):
-        self.path = path
+    def __init__(self, path: Union[str, os.DirEntry]):
+        self.path = os.fspath(path)
         self.name = ""
         self.description = ""
         self.instructions = ""
         self.allowed_tools: Optional[List[str]] = None
+        self._resources: Dict[str, str] = {}
         self._load()
+        self._scan_resources()
 
     def _load(self):
         """Load SKILL.md file"""
         skill_md_path = os.path.join(self.path, "SKILL.md")
-        if not os.path.exists(skill_md_path):
-            raise FileNotFoundError(f"SKILL.md not found in {self.path}")
+        try:
+            st = os.stat(skill_md_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"SKILL.md not found in {self.path}") from None
 
         try:
-            with open(skill_md_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            if content.startswith("---"):
-                parts = content.split("---", 2)
-                if len(parts) >= 3:
-                    meta = yaml.safe_load(parts[1]) or {}
-                    self.name = meta.get("name", os.path.basename(self.path))
-                    self.description = meta.get("description", "")
-                    self.allowed_tools = meta.get("allowed-tools")
-                    self.instructions = parts[2].strip()
+            (self.name, self.description, self.instructions,
+             self.allowed_tools) = _parse_skill_md(skill_md_path, st.st_mtime_ns, st.st_size)
         except Exception as e:
             Logger.error(f"Error loading skill at {self.path}: {e}")
             raise e
 
+    def _scan_resources(self):
+        """
+        Index resource files once so lookups don't hit the filesystem
+
+        Lookup precedence (highest first): <name>, <name>.md, templates/<name>, scripts/<name>.
+        Lower-precedence locations are indexed first and overwritten by higher ones.
+        """
+        resources: Dict[str, str] = {}
+        for sub in ("scripts", "templates"):
+            for entry in self._scan_files(os.path.join(self.path, sub)):
+                resources[entry.name] = entry.path
+        root_files = self._scan_files(self.path)
+        for entry in root_files:
+            if entry.name.endswith(".md"):
+                resources[entry.name[:-3]] = entry.path
+        for entry in root_files:
+            resources[entry.name] = entry.path
+        self._resources = resources
+
+    @staticmethod
+    def _scan_files(directory: str) -> List[os.DirEntry]:
+        try:
+            with os.scandir(directory) as it:
+                return [entry for entry in it if entry.is_file()]
+        except OSError:
+            return []
+
     def get_resource_path(self, resource_name: str) -> Optional[str]:
         """Get absolute path of resource in skill directory"""
         # Prevent path traversal
-        resource_name = os.path.basename(resource_name)
-        
-        # Try common locations
-        possible_paths = [
-            os.path.join(self.path, resource_name),
-            os.path.join(self.path, f"{resource_name}.md"),
-            os.path.join(self.path, "templates", resource_name),
-            os.path.join(self.path, "scripts", resource_name)
-        ]
-        
-        for p in possible_paths:
-            if os.path.exists(p):
-                return p
-        return None
+        return self._resources.get(os.path.basename(resource_name))
 
 class SkillRegistry:
     """
@@ -74,50 +176,77 @@ class SkillRegistry:
     def __init__(self, skills_dir: str):
         self.skills_dir = skills_dir
         self.skills: Dict[str, Skill] = {}
+        # Inverted index: keyword -> [(skill_name, weight)]
+        self._index: Dict[str, List[Tuple[str, int]]] = {}
         self._load_skills()
 
     def _load_skills(self):
         """Scan skill directory and load all valid skills"""
         self.load_skills_from_dir(self.skills_dir)
 
+    def reload(self):
+        """
+        Rescan skill directory
+
+        Unchanged SKILL.md files are served from the parse cache;
+        only files whose mtime/size changed are re-read.
+        """
+        self.skills = {}
+        self._load_skills()
+
     def load_skills_from_dir(self, skills_dir: str):
         """Load skills from specified directory"""
-        if not os.path.exists(skills_dir):
+        try:
+            entries = list(os.scandir(skills_dir))
+        except FileNotFoundError:
             return
 
-        for entry in os.scandir(skills_dir):
+        for entry in entries:
             if entry.is_dir():
                 try:
-                    skill = Skill(entry.path)
+                    skill = Skill(entry)
                     self.skills[skill.name] = skill
                 except Exception:
                     continue
+        self._build_index()
+
+    def _build_index(self):
+        """Rebuild keyword inverted index from skill descriptions"""
+        index: Dict[str, List[Tuple[str, int]]] = {}
+        for name, skill in self.skills.items():
+            for word, weight in Counter(_tokenize(skill.description)).items():
+                index.setdefault(word, []).append((name, weight))
+        self._index = index
 
     def find_best_skill(self, query: str) -> Optional[Skill]:
         """
         Match best skill based on query content
         
-        Current implementation: Keyword matching based on description (simple heuristic).
+        Current implementation: Keyword matching based on description (simple heuristic),
+        whole tokens via the inverted index first, then substrings of the query.
         Future expansion: Semantic matching using LLM.
         """
-        query_lower = query.lower()
-        best_match = None
-        max_score = 0
-
-        for skill in self.skills.values():
-            # Simple keyword weighting
-            score = 0
-            desc_words = skill.description.lower().replace(",", " ").replace(".", " ").split()
-            for word in desc_words:
-                if len(word) > 2 and word in query_lower:
-                    score += 1
-            
-            if score > max_score:
-                max_score = score
-                best_match = skill
-        
+        scores: Counter = Counter()
+        # dict.fromkeys dedups while keeping query order deterministic
+        for token in dict.fromkeys(_tokenize(query)):
+            for name, weight in self._index.get(token, ()):
+                scores[name] += weight
+
+        if not scores:
+            # No whole-token hit: fall back to keywords contained anywhere in the
+            # query. CJK descriptions have no spaces, so their keywords are long
+            # phrases that only ever match as substrings.
+            query_lower = query.lower()
+            for word, postings in self._index.items():
+                if word in query_lower:
+                    for name, weight in postings:
+                        scores[name] += weight
+
         # Return only if score exceeds threshold (avoid false positives)
-        return best_match if max_score >= 1 else None
+        if not scores:
+            return None
+        name, max_score = scores.most_common(1)[0]
+        return self.skills.get(name) if max_score >= 1 else None
 
     def get_skill(self, name: str) -> Optional[Skill]:
         """Get skill by name"""
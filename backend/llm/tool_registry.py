@@ -19,22 +19,41 @@ Design Philosophy:
 """
 
 import os
+import json
+import types
+import importlib
+import dataclasses
+import functools
 import yaml
-from typing import Dict, Any, List, Callable, Optional, Type
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, Optional, Tuple, Type
 from backend.llm.skill_registry import SkillRegistry
+from backend.llm.types import AgentSpec
 from backend.tools.base import BaseTool
 from backend.tools.subagent import AgentTool
-from backend.tools.web_search import SearchTool
-from backend.tools.web_reader import WebReaderTool
-from backend.tools.read_file import ReadFileTool
-from backend.tools.write_file import WriteFileTool
-from backend.tools.bash import BashTool
-from backend.tools.edit_file import EditFileTool
-from backend.tools.activate_skill import ActivateSkillTool
-from backend.tools.grep import GrepTool
-from backend.tools.glob import GlobTool
 from backend.utils.logger import Logger
 
+# Frontmatter values are plain strings/lists, so skip implicit type resolution
+# (bools, ints, timestamps) with BaseLoader; libyaml C variant when available
+YamlLoader = getattr(yaml, "CBaseLoader", yaml.BaseLoader)
+# BaseLoader keeps YAML null spellings as strings
+_YAML_NULLS = frozenset(("", "~", "null", "Null", "NULL"))
+Logger.info(f"[AgentRegistry] YAML frontmatter loader: {YamlLoader.__name__}")
+
+
+# Atomic tools: name -> (module, class); imported on first instantiation
+_BUILTIN_TOOLS: Dict[str, Tuple[str, str]] = {
+    "web_search": ("backend.tools.web_search", "SearchTool"),
+    "web_reader": ("backend.tools.web_reader", "WebReaderTool"),
+    "read_file": ("backend.tools.read_file", "ReadFileTool"),
+    "write_file": ("backend.tools.write_file", "WriteFileTool"),
+    "edit_file": ("backend.tools.edit_file", "EditFileTool"),
+    "grep": ("backend.tools.grep", "GrepTool"),
+    "glob": ("backend.tools.glob", "GlobTool"),
+    "bash": ("backend.tools.bash", "BashTool"),
+    "activate_skill": ("backend.tools.activate_skill", "ActivateSkillTool"),
+}
+
 
 class ToolRegistry:
     """
@@ -46,20 +65,51 @@ class ToolRegistry:
     def __init__(self):
         """Initialize Tool Registry"""
         self._factories: Dict[str, Callable[[], BaseTool]] = {}
+        self._frozen = False
     
     def register_factory(self, name: str, factory: Callable[[], BaseTool]):
         """
         Register tool factory function
         """
+        if self._frozen:
+            raise RuntimeError(f"ToolRegistry is frozen; cannot register '{name}'")
         self._factories[name] = factory
     
+    def freeze(self):
+        """
+        Make the registry read-only
+        
+        Called once bootstrap has registered everything; the factory table is
+        swapped for a read-only view so later lookups hit a compact, fixed dict.
+        """
+        if not self._frozen:
+            self._factories = types.MappingProxyType(dict(self._factories))
+            self._frozen = True
+    
     def register_tool_class(self, name: str, tool_cls: Type[BaseTool]):
         """
         Register tool class (convenience method)
         
-        Automatically creates factory function calling tool class no-arg constructor.
+        The class itself is the factory (its no-arg constructor).
+        """
+        self.register_factory(name, tool_cls)
+    
+    def register_lazy_tool_class(self, name: str, module: str, attr: str):
+        """
+        Register tool class by import path
+        
+        The module is imported when the tool is first created, so tools a
+        session never uses don't pay their import cost at bootstrap.
         """
-        self.register_factory(name, lambda: tool_cls())
+        tool_cls = None
+        
+        def factory() -> BaseTool:
+            nonlocal tool_cls
+            if tool_cls is None:
+                tool_cls = getattr(importlib.import_module(module), attr)
+            return tool_cls()
+        
+        self.register_factory(name, factory)
     
     def create_tool(self, name: str, context: Optional[Dict] = None) -> Optional[BaseTool]:
         """
@@ -69,7 +119,7 @@ class ToolRegistry:
         If context provided, calls tool's configure method.
         """
         factory = self._factories.get(name)
-        if not factory:
+        if factory is None:
             return None
         tool = factory()
         if tool and context:
@@ -85,6 +135,111 @@ class ToolRegistry:
         """
         return list(self._factories.keys())
 
+# Below this many agent files, serial loading beats thread pool setup
+_PARALLEL_LOAD_THRESHOLD = 3
+
+# file path -> ((mtime_ns, size), parsed agent); shared across registries/bootstraps
+_AGENT_CACHE: Dict[str, Tuple[Tuple[int, int], Optional[AgentSpec]]] = {}
+
+def _load_agent_file(file_path: str, agent_id: str, st: os.stat_result) -> Optional[AgentSpec]:
+    """
+    Parse agent file, reusing cached results while mtime and size are unchanged
+
+    Lookup order: in-process cache, then the on-disk sidecar written by earlier
+    runs (agents_dir/.cache/<file>.json), then a real parse.
+    """
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _AGENT_CACHE.get(file_path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    sidecar = os.path.join(os.path.dirname(file_path), ".cache", os.path.basename(file_path) + ".json")
+    agent = _read_agent_sidecar(sidecar, file_path, stamp)
+    if agent is None:
+        agent = _parse_agent_file(file_path, agent_id)
+        _write_agent_sidecar(sidecar, stamp, agent)
+    _AGENT_CACHE[file_path] = (stamp, agent)
+    return agent
+
+def _read_agent_sidecar(sidecar: str, file_path: str, stamp: Tuple[int, int]) -> Optional[AgentSpec]:
+    try:
+        with open(sidecar, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("stamp") != list(stamp):
+        return None
+    agent = data.get("agent")
+    if not isinstance(agent, dict) or agent.get("path") != file_path:
+        return None
+    try:
+        return AgentSpec(**{**agent, "allowed_tools": tuple(agent.get("allowed_tools") or ())})
+    except TypeError:
+        return None # Sidecar written with a different field set
+
+def _write_agent_sidecar(sidecar: str, stamp: Tuple[int, int], agent: Optional[AgentSpec]):
+    # Best effort: a read-only agents dir or non-JSON frontmatter just skips the sidecar
+    if not agent:
+        return
+    tmp_path = f"{sidecar}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"stamp": list(stamp), "agent": dataclasses.asdict(agent)}, f, ensure_ascii=False)
+        os.replace(tmp_path, sidecar)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def _parse_agent_file(file_path: str, agent_id: str) -> Optional[AgentSpec]:
+    """
+    Parse one agent definition file
+
+    Reads line by line up to the closing frontmatter delimiter so YAML only sees
+    the header; files without frontmatter are skipped after their first line.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        first_line = f.readline()
+        if not first_line.startswith('---'):
+            return None
+
+        header = [first_line[3:]]
+        for line in f:
+            if line.startswith('---'):
+                break
+            header.append(line)
+        else:
+            return None # No closing delimiter
+
+        # Rest of the delimiter line plus body; the delimiter line is normally bare,
+        # so avoid concatenating (copying) the whole body onto it
+        tail = line[3:]
+        body = f.read()
+        instructions = (tail + body).strip() if tail.strip() else body.strip()
+
+    meta = yaml.load(''.join(header), Loader=YamlLoader) or {}
+
+    # Parse tools (supports string and list format)
+    # Compatible with old allowed-tools and new tools
+    raw_tools = meta.get("tools") or meta.get("allowed-tools") or []
+    if isinstance(raw_tools, str):
+        tools = tuple(t.strip() for t in raw_tools.split(','))
+    elif isinstance(raw_tools, list):
+        tools = tuple(raw_tools)
+    else:
+        tools = ()
+
+    return AgentSpec(
+        name=meta.get("name", agent_id),
+        description=meta.get("description", ""),
+        instructions=instructions,
+        allowed_tools=tools,
+        model=None if meta.get("model") in _YAML_NULLS else meta.get("model"),
+        path=file_path
+    )
+
 class AgentRegistry:
     """
     Subagent Registry
@@ -114,7 +269,7 @@ class AgentRegistry:
             agents_dir: Directory containing agent definition files
         """
         self.agents_dir = agents_dir
-        self.agents: Dict[str, Dict[str, Any]] = {}
+        self.agents: Dict[str, AgentSpec] = {}
         self._load_agents()
     
     def _load_agents(self):
@@ -124,52 +279,51 @@ class AgentRegistry:
         Scans all .md files in agents_dir.
         Parses YAML Frontmatter and Markdown content.
         """
-        if not os.path.exists(self.agents_dir):
+        try:
+            it = os.scandir(self.agents_dir)
+        except FileNotFoundError:
             return
         
-        for filename in os.listdir(self.agents_dir):
-            if not filename.endswith('.md'):
-                continue
-                
-            file_path = os.path.join(self.agents_dir, filename)
-            agent_id = filename[:-3] # Remove .md suffix
-            
+        candidates = []
+        with it:
+            for entry in it:
+                filename = entry.name
+                # Name test first: non-agent entries cost no path join or stat
+                if not filename.endswith('.md'):
+                    continue
+                try:
+                    # DirEntry carries the joined path and caches its stat result
+                    if entry.is_file():
+                        candidates.append((filename[:-3], filename, entry.path, entry.stat())) # Remove .md suffix
+                except OSError as e:
+                    print(f"Error loading agent from '{filename}': {e}")
+
+        def load(candidate):
+            agent_id, _, file_path, st = candidate
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                    # Parse YAML Frontmatter
-                    if content.startswith('---'):
-                        parts = content.split('---', 2)
-                        if len(parts) >= 3:
-                            meta = yaml.safe_load(parts[1]) or {}
-                            
-                            # Parse tools (supports string and list format)
-                            # Compatible with old allowed-tools and new tools
-                            raw_tools = meta.get("tools") or meta.get("allowed-tools") or []
-                            if isinstance(raw_tools, str):
-                                tools = [t.strip() for t in raw_tools.split(',')]
-                            elif isinstance(raw_tools, list):
-                                tools = raw_tools
-                            else:
-                                tools = []
-                            
-                            self.agents[agent_id] = {
-                                "name": meta.get("name", agent_id),
-                                "description": meta.get("description", ""),
-                                "instructions": parts[2].strip(),
-                                "allowed_tools": tools,
-                                "model": meta.get("model"),
-                                "path": file_path
-                            }
+                return _load_agent_file(file_path, agent_id, st), None
             except Exception as e:
-                print(f"Error loading agent from '{filename}': {e}")
+                return None, e
+
+        # File reads release the GIL; a pool only pays off beyond a handful of files
+        if len(candidates) > _PARALLEL_LOAD_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=min(8, len(candidates))) as pool:
+                results = list(pool.map(load, candidates))
+        else:
+            results = [load(c) for c in candidates]
+
+        # Populate from this thread only, in directory order
+        for (agent_id, filename, _, _), (agent, error) in zip(candidates, results):
+            if error is not None:
+                print(f"Error loading agent from '{filename}': {error}")
+            elif agent:
+                self.agents[agent_id] = agent
     
-    def get_agent(self, name: str) -> Optional[Dict[str, Any]]:
+    def get_agent(self, name: str) -> Optional[AgentSpec]:
         """Get data for specific agent"""
         return self.agents.get(name)
     
-    def get_all_agents(self) -> List[Dict[str, Any]]:
+    def get_all_agents(self) -> List[AgentSpec]:
         """Get all loaded agents"""
         return list(self.agents.values())
 
@@ -182,14 +336,9 @@ def bootstrap_llm(agents_dir: str, skills_dir: str, engine_factory: Callable) ->
     # Create tool registry
     registry = ToolRegistry()
     
-    # Register all atomic tools
-    registry.register_tool_class("web_search", SearchTool)
-    registry.register_tool_class("web_reader", WebReaderTool)
-    registry.register_tool_class("read_file", ReadFileTool)
-    registry.register_tool_class("write_file", WriteFileTool)
-    registry.register_tool_class("edit_file", EditFileTool)
-    registry.register_tool_class("grep", GrepTool)
-    registry.register_tool_class("glob", GlobTool)
+    # Register all atomic tools (imported on first use)
+    for name, (module, attr) in _BUILTIN_TOOLS.items():
+        registry.register_lazy_tool_class(name, module, attr)
     
     # Register browser_use tool (check if browser installed first)
     try:
@@ -202,8 +351,6 @@ def bootstrap_llm(agents_dir: str, skills_dir: str, engine_factory: Callable) ->
     except (ImportError, ModuleNotFoundError) as e:
         Logger.warning(f"[ToolRegistry] browser_use dependency not found: {e}. BrowserUseTool will not be available.")
     
-    registry.register_tool_class("bash", BashTool)
-    registry.register_tool_class("activate_skill", ActivateSkillTool)
     # registry.register_tool_class("read_skill_resource", SkillResourceTool)
     # registry.register_tool_class("query_goal", QueryGoalTool)
     # registry.register_tool_class("query_intent", QueryIntentTool)
@@ -219,19 +366,19 @@ def bootstrap_llm(agents_dir: str, skills_dir: str, engine_factory: Callable) ->
     
     # Wrap subagents as tools and register, maintain backward compatibility (some agents might need to call others)
     for agent_data in agent_registry.get_all_agents():
-        def create_agent_tool(a_data=agent_data):
-            # Reuse AgentTool logic, as it essentially executes a subtask with Prompt and Tools
-            return AgentTool(
-                agent_data=a_data,
-                engine_factory=engine_factory,
-                tool_registry=registry,
-                agent_registry=agent_registry,
-                skill_registry=skill_registry
-            )
-        registry.register_factory(agent_data["name"], create_agent_tool)
+        # Reuse AgentTool logic, as it essentially executes a subtask with Prompt and Tools
+        registry.register_factory(agent_data.name, functools.partial(
+            AgentTool,
+            agent_data=agent_data,
+            engine_factory=engine_factory,
+            tool_registry=registry,
+            agent_registry=agent_registry,
+            skill_registry=skill_registry
+        ))
     
     # Save registry references
     registry._agent_registry = agent_registry
     registry._skill_registry = skill_registry
+    registry.freeze()
     
     return registry, agent_registry, skill_registry
@@ -5,7 +5,7 @@ Defines core data types and configuration structures for LLM platform.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Union, Callable
+from typing import List, Dict, Any, Optional, Union, Callable, Tuple
 
 
 @dataclass
@@ -48,6 +48,10 @@ class SystemPromptConfig:
     
     base_prompt: str = "You are a helpful assistant."
     extra_sections: List[str] = field(default_factory=list)
+    # Parts the cached prompt was built from; middleware mutates extra_sections
+    # in place (append/insert/setitem), so compare contents rather than track writes
+    _built_from: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    _built: str = field(default="", init=False, repr=False, compare=False)
     
     def build(self) -> str:
         """
@@ -67,8 +71,38 @@ class SystemPromptConfig:
             >>> config.build()
             'You are an expert.\\n\\nRule 1: Be concise.\\n\\nRule 2: Be accurate.'
         """
-        parts = [self.base_prompt] + self.extra_sections
-        return "\n\n".join(parts)
+        parts = (self.base_prompt, *self.extra_sections)
+        # Tuple equality checks identity first, so unchanged sections cost a pointer compare
+        if parts != self._built_from:
+            self._built = "\n\n".join(parts)
+            self._built_from = parts
+        return self._built
+
+
+@dataclass(slots=True, frozen=True)
+class AgentSpec:
+    """
+    Subagent Definition
+    
+    Immutable record for one agent parsed from a Markdown definition file
+    (see AgentRegistry). Slotted to keep per-agent memory small and attribute
+    reads cheap when tool schemas are rebuilt on every request.
+    
+    Attributes:
+        name: Agent name (also its tool name)
+        description: Short description shown to the LLM
+        instructions: Markdown body, used as the subagent's system prompt
+        allowed_tools: Names of tools the subagent may use
+        model: Provider key override, None to inherit the caller's
+        path: Source file path
+    """
+    
+    name: str
+    description: str
+    instructions: str
+    allowed_tools: Tuple[str, ...]
+    model: Optional[str]
+    path: str
 
 
 @dataclass
@@ -2,12 +2,53 @@ from typing import Dict, Any, Optional
 from backend.tools.base import BaseTool
 from backend.llm.decorators import schema_strict_validator
 
+# Activation result; filled with a single format() per call
+_ACTIVATED_TMPL = (
+    "--- SKILL ACTIVATED: {name} ---\n"
+    "Skill Base Path: {path}\n"
+    "Instructions:\n{instructions}\n"
+    "--- END SKILL ---\n\n"
+    "IMPORTANT:\n"
+    "1. From now on, you MUST strictly follow the SOP and instructions provided above for the subsequent steps.\n"
+    "2. All resource paths mentioned in the instructions, if relative, are based on the 'Skill Base Path' ({path}).\n"
+    "3. You can (and should) use bash commands to list the directory tree under the Skill Base Path to locate resources before proceeding."
+)
+
 class ActivateSkillTool(BaseTool):
     """
     ActivateSkillTool: 获取并激活特定技能的内容。
     """
+    DESCRIPTION_TEMPLATE = (
+        "Activate and retrieve the specific SOP (Standard Operating Procedure) and instructions for a skill. "
+        "Use this when you identify that a specialized skill is required to complete the task. "
+        "Available skills: {skills_list}"
+    )
+
+    PARAMETERS_SCHEMA: Dict[str, Any] = {
+        "type": "object",
+        "properties": {
+            "skill_name": {
+                "type": "string",
+                "description": "The name of the skill to activate."
+            }
+        },
+        "required": ["skill_name"]
+    }
+
     def __init__(self, skill_registry: Any = None):
         self.skill_registry = skill_registry
+        self._description: Optional[str] = None
+
+    @property
+    def skill_registry(self) -> Any:
+        return self._skill_registry
+
+    @skill_registry.setter
+    def skill_registry(self, skill_registry: Any):
+        self._skill_registry = skill_registry
+        # Bound once; execute calls it directly
+        self._get_skill = skill_registry.get_skill if skill_registry is not None else None
+        self._description = None # Re-render skills list for the new registry
 
     @property
     def name(self) -> str:
@@ -15,24 +56,17 @@ class ActivateSkillTool(BaseTool):
 
     @property
     def description(self) -> str:
-        return (
-            "Activate and retrieve the specific SOP (Standard Operating Procedure) and instructions for a skill. "
-            "Use this when you identify that a specialized skill is required to complete the task. "
-            "Available skills: {skills_list}"
-        )
+        # Rendered once per registry, then reused for every schema build
+        if self._description is None:
+            if self._skill_registry is None:
+                return self.DESCRIPTION_TEMPLATE
+            skills_list = ", ".join([f"'{s['name']}'" for s in self._skill_registry.get_skills_metadata()])
+            self._description = self.DESCRIPTION_TEMPLATE.format(skills_list=skills_list)
+        return self._description
 
     @property
     def parameters_schema(self) -> Dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "skill_name": {
-                    "type": "string",
-                    "description": "The name of the skill to activate."
-                }
-            },
-            "required": ["skill_name"]
-        }
+        return self.PARAMETERS_SCHEMA
 
     def configure(self, context: Dict[str, Any]):
         """注入注册中心"""
@@ -41,22 +75,12 @@ class ActivateSkillTool(BaseTool):
 
     @schema_strict_validator
     def execute(self, skill_name: str) -> str:
-        if not self.skill_registry:
+        if self._get_skill is None:
             return "Error: Skill registry not initialized."
             
-        skill = self.skill_registry.get_skill(skill_name)
+        skill = self._get_skill(skill_name)
         if not skill:
             return f"Error: Skill '{skill_name}' not found."
             
         # 返回技能内容
-        result = (
-            f"--- SKILL ACTIVATED: {skill.name} ---\n"
-            f"Skill Base Path: {skill.path}\n"
-            f"Instructions:\n{skill.instructions}\n"
-            "--- END SKILL ---\n\n"
-            "IMPORTANT:\n"
-            "1. From now on, you MUST strictly follow the SOP and instructions provided above for the subsequent steps.\n"
-            f"2. All resource paths mentioned in the instructions, if relative, are based on the 'Skill Base Path' ({skill.path}).\n"
-            "3. You can (and should) use bash commands to list the directory tree under the Skill Base Path to locate resources before proceeding."
-        )
-        return result
+        return _ACTIVATED_TMPL.format(name=skill.name, path=skill.path, instructions=skill.instructions)
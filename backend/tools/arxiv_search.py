@@ -1,14 +1,68 @@
+import time
+import threading
 import requests
 import xml.etree.ElementTree as ET
-from typing import Dict, Any, List
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, List, Tuple
 from backend.llm.decorators import schema_strict_validator
 
+# Fully-qualified Atom tags, resolved once instead of per-lookup namespace maps
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_ENTRY_TAG = _ATOM + "entry"
+_TITLE_TAG = _ATOM + "title"
+_SUMMARY_TAG = _ATOM + "summary"
+_PUBLISHED_TAG = _ATOM + "published"
+_AUTHOR_TAG = _ATOM + "author"
+_NAME_TAG = _ATOM + "name"
+_ID_TAG = _ATOM + "id"
+
+# Shared keep-alive session: repeated queries reuse the TCP connection to arxiv.org
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+_SESSION.headers["Accept-Encoding"] = "gzip"
+
+
+def _iter_entries(source):
+    """
+    Stream-parse an arXiv Atom feed, yielding one dict per entry.
+    Each entry subtree is cleared once read, so the full DOM is never built.
+    """
+    for _, elem in ET.iterparse(source, events=("end",)):
+        if elem.tag != _ENTRY_TAG:
+            continue
+        yield {
+            "title": elem.find(_TITLE_TAG).text.strip().replace('\n', ' '),
+            "summary": elem.find(_SUMMARY_TAG).text.strip().replace('\n', ' '),
+            "published": elem.find(_PUBLISHED_TAG).text,
+            "authors": [author.find(_NAME_TAG).text for author in elem.iter(_AUTHOR_TAG)],
+            "link": elem.find(_ID_TAG).text,
+        }
+        elem.clear()
+
 class ArxivSearchTool:
     """
     Search Arxiv for research papers.
     Uses the official arXiv API (http://export.arxiv.org/api/query).
     """
 
+    PARAMETERS_SCHEMA: Dict[str, Any] = {
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "Search query syntax (e.g. 'all:electron', 'ti:attention+AND+au:vaswani')."
+            },
+            "max_results": {
+                "type": "integer",
+                "description": "Maximum number of results to return (default 5).",
+                "default": 5
+            }
+        },
+        "required": ["query"]
+    }
+
     @property
     def name(self) -> str:
         return "arxiv_search"
@@ -19,72 +73,89 @@ class ArxivSearchTool:
 
     @property
     def parameters_schema(self) -> Dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "query": {
-                    "type": "string",
-                    "description": "Search query syntax (e.g. 'all:electron', 'ti:attention+AND+au:vaswani')."
-                },
-                "max_results": {
-                    "type": "integer",
-                    "description": "Maximum number of results to return (default 5).",
-                    "default": 5
-                }
-            },
-            "required": ["query"]
-        }
+        return self.PARAMETERS_SCHEMA
 
     def to_openai_schema(self) -> Dict[str, Any]:
-        return {
-            "type": "function",
-            "function": {
-                "name": self.name,
-                "description": self.description,
-                "parameters": self.parameters_schema
+        # Name, description and parameters are constant: build the schema once
+        cached = self.__dict__.get("_openai_schema")
+        if cached is None:
+            cached = self._openai_schema = {
+                "type": "function",
+                "function": {
+                    "name": self.name,
+                    "description": self.description,
+                    "parameters": self.parameters_schema
+                }
             }
-        }
+        return cached
 
     @schema_strict_validator
     def execute(self, query: str, max_results: int = 5) -> str:
-        base_url = "http://export.arxiv.org/api/query"
-        params = {
-            "search_query": query,
-            "start": 0,
-            "max_results": max_results
-        }
-        
         try:
-            response = requests.get(base_url, params=params, timeout=10)
-            if response.status_code != 200:
-                return f"Error: arXiv API returned status code {response.status_code}"
-            
-            # Parse XML response
-            root = ET.fromstring(response.content)
-            
-            # Namespace for arXiv API
-            ns = {'atom': 'http://www.w3.org/2005/Atom', 'arxiv': 'http://arxiv.org/schemas/atom'}
-            
-            entries = root.findall('atom:entry', ns)
-            if not entries:
-                return "No results found."
-            
-            results = []
-            for i, entry in enumerate(entries):
-                title = entry.find('atom:title', ns).text.strip().replace('\n', ' ')
-                summary = entry.find('atom:summary', ns).text.strip().replace('\n', ' ')
-                published = entry.find('atom:published', ns).text
-                
-                authors = []
-                for author in entry.findall('atom:author', ns):
-                    name = author.find('atom:name', ns).text
-                    authors.append(name)
-                
-                link = entry.find('atom:id', ns).text
-                
-                results.append(f"[{i+1}] **{title}**\n   Authors: {', '.join(authors)}\n   Published: {published}\n   Link: {link}\n   Summary: {summary[:300]}...\n")
-            
-            return "\n".join(results)
-            
+            return _query_arxiv(query, max_results)
         except Exception as e:
             return f"Error querying arXiv API: {str(e)}"
+
+
+# (query, max_results) -> (fetched_at, formatted result); LRU with TTL
+_CACHE_TTL = 600.0
+_CACHE_MAXSIZE = 128
+_cache: "OrderedDict[Tuple[str, int], Tuple[float, str]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _query_arxiv(query: str, max_results: int) -> str:
+    """Formatted arXiv results; repeated queries within the TTL skip HTTP and XML parsing"""
+    key = (query, max_results)
+    now = time.monotonic()
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit is not None and now - hit[0] < _CACHE_TTL:
+            _cache.move_to_end(key)
+            return hit[1]
+
+    result, cacheable = _fetch_arxiv(query, max_results)
+    if cacheable:
+        with _cache_lock:
+            _cache[key] = (now, result)
+            _cache.move_to_end(key)
+            while len(_cache) > _CACHE_MAXSIZE:
+                _cache.popitem(last=False)
+    return result
+
+
+def _fetch_arxiv(query: str, max_results: int) -> Tuple[str, bool]:
+    """Query the arXiv API; returns (text, cacheable) - API errors are not cached"""
+    base_url = "http://export.arxiv.org/api/query"
+    params = {
+        "search_query": query,
+        "start": 0,
+        "max_results": max_results
+    }
+
+    with _SESSION.get(base_url, params=params, timeout=10, stream=True) as response:
+        if response.status_code != 200:
+            return f"Error: arXiv API returned status code {response.status_code}", False
+
+        # Parse XML response incrementally from the socket
+        response.raw.decode_content = True
+        buf: List[str] = []
+        append = buf.append
+        for i, entry in enumerate(_iter_entries(response.raw), 1):
+            if i > 1:
+                append("\n")
+            append(f"[{i}] **")
+            append(entry["title"])
+            append("**\n   Authors: ")
+            append(", ".join(entry["authors"]))
+            append("\n   Published: ")
+            append(entry["published"])
+            append("\n   Link: ")
+            append(entry["link"])
+            append("\n   Summary: ")
+            append(entry["summary"][:300])
+            append("...\n")
+
+    if not buf:
+        return "No results found.", True
+    return "".join(buf), True
@@ -22,6 +22,10 @@ class BaseTool(ABC):
     """
     Abstract Base Class for all executable tools
     """
+
+    # Set True in subclasses whose name/description/parameters never change after
+    # construction; to_openai_schema then builds the schema once per instance.
+    static_schema = False
     
     def __init_subclass__(cls, **kwargs):
         """
@@ -88,7 +92,11 @@ class BaseTool(ABC):
         Convert tool to OpenAI Function Calling format Schema
         Used for passing to LLM in API calls.
         """
-        return {
+        if self.static_schema:
+            cached = self.__dict__.get("_openai_schema")
+            if cached is not None:
+                return cached
+        schema = {
             "type": "function",
             "function": {
                 "name": self.name,
@@ -96,5 +104,8 @@ class BaseTool(ABC):
                 "parameters": self.parameters_schema
             }
         }
+        if self.static_schema:
+            self._openai_schema = schema
+        return schema
 
 
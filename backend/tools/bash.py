@@ -9,6 +9,28 @@ class BashTool(BaseTool):
     执行 Bash 命令的工具。
     现在是环境感知的 (Environment-Aware)，通过注入的 Environment 实例执行命令。
     """
+    static_schema = True
+
+    PARAMETERS_SCHEMA: Dict[str, Any] = {
+        "type": "object",
+        "properties": {
+            "command": {
+                "type": "string",
+                "description": "The full bash command to execute."
+            },
+            "cwd": {
+                "type": "string",
+                "description": "Optional. The working directory to execute the command in. Defaults to the environment's current working directory."
+            },
+            "wait": {
+                "type": "boolean",
+                "description": "Whether to wait for command completion (default True). Set to False to run in background.",
+                "default": True
+            }
+        },
+        "required": ["command"]
+    }
+
     def __init__(self, env: Optional[Environment] = None):
         """
         Args:
@@ -16,6 +38,16 @@ class BashTool(BaseTool):
         """
         super().__init__()
         self.env = env
+
+    @property
+    def env(self) -> Optional[Environment]:
+        return self._env
+
+    @env.setter
+    def env(self, env: Optional[Environment]):
+        self._env = env
+        # Bind once so execute skips the method lookup on every command
+        self._run = env.run_command if env is not None else None
     
     @property
     def name(self) -> str:
@@ -34,25 +66,7 @@ class BashTool(BaseTool):
 
     @property
     def parameters_schema(self) -> Dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "command": {
-                    "type": "string",
-                    "description": "The full bash command to execute."
-                },
-                "cwd": {
-                    "type": "string",
-                    "description": "Optional. The working directory to execute the command in. Defaults to the environment's current working directory."
-                },
-                "wait": {
-                    "type": "boolean",
-                    "description": "Whether to wait for command completion (default True). Set to False to run in background.",
-                    "default": True
-                }
-            },
-            "required": ["command"]
-        }
+        return self.PARAMETERS_SCHEMA
 
     def configure(self, context: Dict[str, Any]):
         """Inject environment from context"""
@@ -71,9 +85,9 @@ class BashTool(BaseTool):
         if not command:
             return "Error: Command is required."
 
-        if not self.env:
+        if self._run is None:
             return "Error: No execution environment configured for BashTool."
 
         # Delegate execution to the environment
         # The environment implementation handles safety checks (Local) or API calls (E2B/Docker)
-        return self.env.run_command(command, cwd=cwd, background=(not wait))
+        return self._run(command, cwd=cwd, background=(not wait))
@@ -1,9 +1,11 @@
 import asyncio
-import glob
+import atexit
+import functools
 import os
 import platform
-from pathlib import Path
-from typing import Any, Dict, Optional
+import threading
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Any, Dict, List, Optional, Tuple
 from backend.llm.decorators import schema_strict_validator
 
 from browser_use import Browser, BrowserProfile
@@ -12,19 +14,65 @@ from browser_use.agent.views import AgentHistoryList  # type: ignore[import-unty
 from browser_use.llm.base import BaseChatModel  # type: ignore[import-untyped]
 from browser_use.llm.openai.chat import ChatOpenAI  # type: ignore[import-untyped]
 
-try:
-    import nest_asyncio  # type: ignore[import]
-except ImportError:  # pragma: no cover
-    nest_asyncio = None
-
-# Module-level flag to prevent repeated nest_asyncio.apply() calls
-_nest_asyncio_applied = False
-
+from backend.infra.auth import AuthManager
 from backend.infra.config import Config
 from backend.tools.base import BaseTool
 from backend.utils.logger import Logger
 
 DEFAULT_MAX_STEPS = 50
+# Matches the engine's browser_use timeout; past it the task is cancelled, not left running
+EXECUTE_TIMEOUT = 60
+
+# Event loop on a daemon thread that runs every synchronous execute() call
+_bg_loop: Optional[asyncio.AbstractEventLoop] = None
+_bg_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Return the background loop, starting its thread on first use."""
+    global _bg_loop
+    with _bg_loop_lock:
+        if _bg_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="browser-use-loop", daemon=True).start()
+            _bg_loop = loop
+        return _bg_loop
+
+
+def _run_in_background(coro, timeout: Optional[float] = None):
+    """Run *coro* on the background loop and wait; cancel it if the wait is abandoned."""
+    future = asyncio.run_coroutine_threadsafe(coro, _background_loop())
+    try:
+        return future.result(timeout=timeout)
+    except BaseException:
+        # Timeout or interrupt: stop the task so it doesn't keep driving the browser
+        future.cancel()
+        raise
+
+
+# platform.system() -> (default Playwright browsers dir, Chromium executables inside chromium-<rev>/)
+_PLAYWRIGHT_LAYOUTS = {
+    'Darwin': (
+        os.path.expanduser('~/Library/Caches/ms-playwright'),
+        (
+            'chrome-mac-arm64/Google Chrome for Testing.app/Contents/MacOS/Google Chrome for Testing',
+            'chrome-mac/Chromium.app/Contents/MacOS/Chromium',
+        ),
+    ),
+    'Linux': (
+        os.path.expanduser('~/.cache/ms-playwright'),
+        ('chrome-linux/chrome',),
+    ),
+    'Windows': (
+        os.environ.get('LOCALAPPDATA', '') + r'\ms-playwright',
+        ('chrome-win\\chrome.exe',),
+    ),
+}
+
+
+# Discovered Chromium path, shared with child processes and across restarts
+_CHROMIUM_PATH_ENV = 'NANO_AGENT_CHROMIUM_PATH'
+_CHROMIUM_PATH_FILE = os.path.join(os.path.expanduser('~'), '.nano_agent_team', 'chromium_path')
 
 
 def _find_playwright_chromium() -> Optional[str]:
@@ -33,46 +81,100 @@ def _find_playwright_chromium() -> Optional[str]:
     
     仅检查文件是否存在，不启动浏览器或 Playwright server，
     因此可以安全地在 asyncio event loop 中调用。
+    结果按 (系统, PLAYWRIGHT_BROWSERS_PATH) 进程内缓存；未找到时不缓存，
+    以便进程运行期间执行 `playwright install` 后能被发现。
     
     Returns:
         Playwright Chromium 路径，如果未安装则返回 None
     """
-    system = platform.system()
-    pw_root = os.environ.get('PLAYWRIGHT_BROWSERS_PATH')
-
-    if system == 'Darwin':
-        if not pw_root:
-            pw_root = '~/Library/Caches/ms-playwright'
-        patterns = [
-            f'{pw_root}/chromium-*/chrome-mac-arm64/Google Chrome for Testing.app/Contents/MacOS/Google Chrome for Testing',
-            f'{pw_root}/chromium-*/chrome-mac/Chromium.app/Contents/MacOS/Chromium',
-        ]
-    elif system == 'Linux':
-        if not pw_root:
-            pw_root = '~/.cache/ms-playwright'
-        patterns = [
-            f'{pw_root}/chromium-*/chrome-linux/chrome',
-        ]
-    elif system == 'Windows':
-        if not pw_root:
-            pw_root = os.environ.get('LOCALAPPDATA', '') + r'\ms-playwright'
-        patterns = [
-            f'{pw_root}\\chromium-*\\chrome-win\\chrome.exe',
-        ]
-    else:
+    path = _locate_playwright_chromium(platform.system(), os.environ.get('PLAYWRIGHT_BROWSERS_PATH'))
+    if path is None:
+        _locate_playwright_chromium.cache_clear()
+    return path
+
+
+@functools.lru_cache(maxsize=4)
+def _locate_playwright_chromium(system: str, pw_root: Optional[str]) -> Optional[str]:
+    """Scan Playwright's browser cache directory for Chromium; memoized per (system, root)."""
+    layout = _PLAYWRIGHT_LAYOUTS.get(system)
+    if layout is None:
+        return None
+    default_root, executables = layout
+    root = os.path.expanduser(pw_root) if pw_root else default_root
+    revisions = _list_chromium_revisions(root)
+    if not revisions:
         return None
 
-    for pattern in patterns:
-        expanded = str(Path(pattern).expanduser())
-        matches = glob.glob(expanded)
-        if matches:
-            matches.sort()
-            if Path(matches[-1]).is_file():
-                return matches[-1]
+    # Path found by an earlier run (exported env var, then the sidecar file);
+    # trusted only while it still exists under the newest revision, so a later
+    # `playwright install` of a newer Chromium is picked up
+    hint = os.environ.get(_CHROMIUM_PATH_ENV) or _read_chromium_hint()
+    newest_prefix = os.path.join(root, revisions[0], '')
+    if hint and hint.startswith(newest_prefix) and os.path.isfile(hint):
+        return hint
+
+    path = _scan_playwright_root(root, revisions, executables)
+    if path:
+        _remember_chromium_path(path)
+    return path
+
+
+def _list_chromium_revisions(root: str) -> List[str]:
+    """'chromium-<rev>' directory names under *root*, newest first."""
+    # One directory listing instead of a glob (fnmatch + stat) per pattern
+    try:
+        with os.scandir(root) as it:
+            revisions = [entry.name for entry in it if entry.name.startswith('chromium-')]
+    except OSError:
+        return []
+
+    # Compare numerically so chromium-1200 beats chromium-999
+    revisions.sort(key=_chromium_revision, reverse=True)
+    return revisions
+
+
+def _scan_playwright_root(root: str, revisions: List[str], executables: tuple) -> Optional[str]:
+    for revision in revisions:
+        for executable in executables:
+            candidate = os.path.join(root, revision, executable)
+            if os.path.isfile(candidate):
+                return candidate
 
     return None
 
 
+def _read_chromium_hint() -> Optional[str]:
+    try:
+        with open(_CHROMIUM_PATH_FILE, 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _remember_chromium_path(path: str) -> None:
+    """Persist a discovered path for child processes and later runs (best effort)."""
+    os.environ[_CHROMIUM_PATH_ENV] = path
+    if _read_chromium_hint() == path:
+        return
+    tmp_path = f"{_CHROMIUM_PATH_FILE}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(_CHROMIUM_PATH_FILE), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(path)
+        os.replace(tmp_path, _CHROMIUM_PATH_FILE)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _chromium_revision(dirname: str) -> int:
+    """Revision number of a 'chromium-<rev>' directory (-1 if not numeric)."""
+    rev = dirname[len('chromium-'):]
+    return int(rev) if rev.isdigit() else -1
+
+
 def check_browser_installed() -> bool:
     """检查 Playwright Chromium 是否已安装。"""
     return _find_playwright_chromium() is not None
@@ -81,6 +183,16 @@ def check_browser_installed() -> bool:
 class BrowserUseTool(BaseTool):
     """A bridge to the browser-use agent for executing multi-step browsing tasks."""
 
+    # Chromium session shared across calls; bound to the event loop that launched it
+    _browser: Optional[Browser] = None
+    _browser_loop: Optional[asyncio.AbstractEventLoop] = None
+    # Held for a whole agent.run on the shared browser: one task drives the session at a time
+    _browser_busy: Optional[asyncio.Lock] = None
+
+    # model key -> LLM client, valid while the (Config, auth) revision is unchanged
+    _llm_cache: Dict[str, BaseChatModel] = {}
+    _llm_cache_rev: Optional[tuple] = None
+
     def __init__(self, get_model_key_fn=None):
         """
         Args:
@@ -124,7 +236,7 @@ class BrowserUseTool(BaseTool):
         task = kwargs.get("task", "")
         return f"\n\n🌐 Starting browser task: {task[:50]}...\n"
 
-    # ── LLM creation (per-execution) ────────────────────────────
+    # ── LLM creation (cached per model) ─────────────────────────
 
     def _resolve_model_key(self) -> Optional[str]:
         """Read current provider/model key, preferring injected callback."""
@@ -167,23 +279,86 @@ class BrowserUseTool(BaseTool):
         return ChatOpenAI(model=model, api_key=api_key, **extra)
 
     def _build_llm(self) -> Optional[BaseChatModel]:
-        """Create a fresh LLM client for a single execution."""
+        """Return the LLM client for the current model, reusing it until config or keys change."""
         model_key = self._resolve_model_key()
         if not model_key:
             Logger.error("[BrowserUseTool] No model selected. Please select a model in TUI first.")
             return None
 
-        llm_config = Config.get_provider_config(model_key)
+        cls = BrowserUseTool
+        Config._ensure_initialized()
+        rev = (Config.revision, AuthManager.revision())
+        if rev != cls._llm_cache_rev:
+            cls._llm_cache = {}
+            cls._llm_cache_rev = rev
+        llm = cls._llm_cache.get(model_key)
+        if llm is not None:
+            return llm
+
+        llm_config = Config.get_cached_provider_config(model_key)
         if not llm_config:
             Logger.error(f"[BrowserUseTool] Config not found for provider: {model_key}")
             return None
 
-        return self._create_llm(llm_config)
+        # ChatOpenAI opens its HTTP client per request, so sharing it across loops is safe
+        llm = self._create_llm(llm_config)
+        if llm is not None:
+            cls._llm_cache[model_key] = llm
+        return llm
+
+    # ── shared browser ──────────────────────────────────────────
+
+    @classmethod
+    async def _claim_browser(cls, browser_path: str) -> Optional[Tuple[Browser, asyncio.Lock]]:
+        """
+        Claim the shared browser for one task, launching it on first use.
+
+        Returns (browser, busy_lock) with busy_lock held - the caller releases it
+        when its agent finishes - or None while another task is still driving the
+        session (e.g. a timed-out call that has not wound down, or a sub-agent).
+        """
+        loop = asyncio.get_running_loop()
+        if cls._browser_loop is not loop:
+            # CDP connections can't cross event loops; start over on this one
+            cls._browser, cls._browser_loop, cls._browser_busy = None, loop, asyncio.Lock()
+        busy = cls._browser_busy
+        if busy.locked():
+            return None
+        # Uncontended acquire completes without yielding, so no other task slips in
+        await busy.acquire()
+        try:
+            if cls._browser is None:
+                # keep_alive stops Agent.close() from killing it after each task
+                cls._browser = Browser(
+                    headless=False,
+                    executable_path=browser_path,
+                    keep_alive=True,
+                )
+        except BaseException:
+            busy.release()
+            raise
+        return cls._browser, busy
+
+    @classmethod
+    async def _release_browser(cls) -> None:
+        """Close the shared browser; the next task launches a fresh one."""
+        browser, cls._browser = cls._browser, None
+        if browser is None:
+            return
+        try:
+            await browser.kill()
+        except Exception as e:
+            Logger.debug(f"[BrowserUseTool] Failed to close browser: {e}")
 
     # ── execution ───────────────────────────────────────────────
 
-    async def execute_async(self, task: str, max_steps: int = DEFAULT_MAX_STEPS) -> str:
-        """Run the browser-use Agent asynchronously and return the final extracted text."""
+    async def execute_async(self, task: str, max_steps: int = DEFAULT_MAX_STEPS, *, shared_browser: bool = True) -> str:
+        """
+        Run the browser-use Agent asynchronously and return the final extracted text.
+
+        With shared_browser=False, or while the shared session is busy with another
+        task, the task gets its own Chromium, closed when the agent finishes.
+        """
         llm = self._build_llm()
         if not llm:
             resp = "Error: BrowserUseTool LLM is not configured. Please select a model in TUI."
@@ -206,10 +381,12 @@ class BrowserUseTool(BaseTool):
         # _saved_no_proxy = os.environ.get('NO_PROXY')
         # os.environ['NO_PROXY'] = os.environ.get('NO_PROXY', '') + ',127.0.0.1,localhost'
 
-        browser = Browser(
-            headless=False,
-            executable_path=browser_path,
-        )
+        claim = await self._claim_browser(browser_path) if shared_browser else None
+        if claim is not None:
+            browser, busy = claim
+        else:
+            # Two agents on one session would fight over the focused tab
+            browser, busy = Browser(headless=False, executable_path=browser_path), None
 
         try:
             agent = Agent(task=task, llm=llm, browser=browser)
@@ -230,38 +407,53 @@ class BrowserUseTool(BaseTool):
         except Exception as exc:  # pragma: no cover
             resp = f"Error executing browser task: {exc}"
             Logger.error(resp)
+            # Browser may be dead (e.g. window closed by user); relaunch next time
+            if busy is not None:
+                await self._release_browser()
             return resp
         finally:
-            pass
+            if busy is not None:
+                busy.release()
             # # 恢复 NO_PROXY 环境变量
             # if _saved_no_proxy is None:
             #     os.environ.pop('NO_PROXY', None)
             # else:
             #     os.environ['NO_PROXY'] = _saved_no_proxy
 
+    async def batch_execute_async(self, tasks: List[Dict[str, Any]], concurrency: int = 4) -> List[str]:
+        """
+        Run several browser tasks concurrently, at most *concurrency* at a time.
+
+        Each item holds execute_async arguments (task, optional max_steps). Tasks
+        use their own browser, since agents sharing one session would fight over
+        the focused tab; they overlap mostly while waiting on the LLM. Results
+        come back in input order, with errors as strings.
+        """
+        sem = asyncio.Semaphore(max(concurrency, 1))
+
+        async def run_one(spec: Dict[str, Any]) -> str:
+            async with sem:
+                return await self.execute_async(**spec, shared_browser=False)
+
+        results = await asyncio.gather(*(run_one(spec) for spec in tasks), return_exceptions=True)
+        return [r if isinstance(r, str) else f"Error executing browser task: {r}" for r in results]
+
+    def batch_execute(self, tasks: List[Dict[str, Any]], concurrency: int = 4) -> List[str]:
+        """Synchronous wrapper around *batch_execute_async*."""
+        return _run_in_background(self.batch_execute_async(tasks, concurrency))
+
     @schema_strict_validator
     def execute(self, task: str, max_steps: Optional[int] = None) -> str:
         """Synchronous wrapper around *execute_async*."""
         coro = self.execute_async(task, max_steps if max_steps is not None else DEFAULT_MAX_STEPS)
+        # Same loop for every call, whether or not the caller has one running:
+        # no re-entering the caller's loop, and the shared browser stays usable
         try:
-            asyncio.get_running_loop()
-        except RuntimeError:
-            return asyncio.run(coro)
-
-        if nest_asyncio is None:
-            msg = (
-                "BrowserUseTool requires nest_asyncio to run from an existing async loop. "
-                "Install nest-asyncio or call execute_async directly."
-            )
-            Logger.error(msg)
-            return msg
-
-        global _nest_asyncio_applied
-        if not _nest_asyncio_applied:
-            nest_asyncio.apply()
-            _nest_asyncio_applied = True
-
-        return asyncio.get_event_loop().run_until_complete(coro)
+            return _run_in_background(coro, timeout=EXECUTE_TIMEOUT)
+        except FuturesTimeoutError:
+            resp = f"Error: Browser task timed out after {EXECUTE_TIMEOUT}s and was cancelled."
+            Logger.error(resp)
+            return resp
 
     # ── helpers ──────────────────────────────────────────────────
 
@@ -296,3 +488,19 @@ class BrowserUseTool(BaseTool):
                 return f"Last actions executed: {', '.join(actions)}."
 
         return "Task completed but browser-use did not produce textual output."
+
+
+@atexit.register
+def _close_shared_browser() -> None:
+    """Close the shared browser at exit, on whichever loop owns it."""
+    loop = BrowserUseTool._browser_loop
+    if BrowserUseTool._browser is None or loop is None or loop.is_closed():
+        return
+    try:
+        if loop.is_running():
+            # Background loop thread (daemon threads still run during atexit)
+            asyncio.run_coroutine_threadsafe(BrowserUseTool._release_browser(), loop).result(timeout=10)
+        else:
+            loop.run_until_complete(BrowserUseTool._release_browser())
+    except Exception:
+        pass
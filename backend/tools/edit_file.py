@@ -63,9 +63,7 @@ class EditFileTool(BaseTool):
             if not self.env.file_exists(file_path):
                 return f"Error: File '{file_path}' does not exist."
 
-            content = self.env.read_file(file_path)
-
-            occurrences = content.count(old_str)
+            occurrences = self.env.replace_unique(file_path, old_str, new_str)
             
             if occurrences == 0:
                 return f"fail: old_str not found in '{file_path}'."
@@ -73,11 +71,8 @@ class EditFileTool(BaseTool):
             if occurrences > 1:
                 return f"fail: old_str found multiple times ({occurrences}) in '{file_path}'. Please provide a more specific segment to ensure a unique replacement."
 
-            # Perform unique replacement
-            new_content = content.replace(old_str, new_str)
-
-            # Write back
-            self.env.write_file(file_path, new_content)
+            if old_str == new_str:
+                return "success (no change: old_str and new_str are identical)"
             return "success"
                 
         except Exception as e:
@@ -3,13 +3,130 @@ Glob Tool - Find files matching patterns
 """
 
 import os
-from typing import Dict, Any, Optional, List
+import re
+import stat
+import fnmatch
+from typing import Dict, Any, Optional, List, Iterator, Tuple, FrozenSet
 from pathlib import Path
 
 from backend.tools.base import BaseTool
 from backend.infra.config import Config
 from backend.llm.decorators import schema_strict_validator
 
+_MAGIC = re.compile(r"[*?\[]")
+# 与 pathlib 一致: POSIX 区分大小写, Windows 不区分
+_CASE_FLAGS = re.IGNORECASE if os.name == "nt" else 0
+_SEP = re.compile(r"[\\/]" if os.sep == "\\" else "/")
+
+
+def _glob_walk(base: str, pattern: str, show_hidden: bool) -> Iterator[Tuple[str, bool, bool]]:
+    """
+    Yield (path, is_dir, is_file) for entries under *base* matching *pattern*.
+
+    Follows Path.glob semantics ('**' matches zero or more directories and does
+    not descend into symlinked dirs), but walks with os.scandir so that hidden
+    directories are pruned before descent and the caller can stop early.
+    Names spelled out literally in the pattern are always honoured, and a
+    trailing separator ('*/', 'src/**/') matches directories only.
+
+    Each directory is visited once with the set of pattern positions still
+    active there, and entries are taken in name order, so results come out
+    already sorted the way sorted(Path.glob(...)) would be.
+    """
+    if os.path.isabs(pattern):
+        raise NotImplementedError("Non-relative patterns are unsupported")
+    segments = [seg for seg in _SEP.split(pattern) if seg not in ("", ".")]
+    if not segments:
+        raise ValueError(f"Unacceptable pattern: {pattern!r}")
+    dirs_only = _SEP.match(pattern[-1]) is not None
+    n = len(segments)
+    literals = [None if seg == "**" or _MAGIC.search(seg) else seg for seg in segments]
+    matchers = [
+        None if seg == "**" else re.compile(fnmatch.translate(seg), _CASE_FLAGS).match
+        for seg in segments
+    ]
+
+    def closure(states) -> FrozenSet[int]:
+        out = set()
+        for i in states:
+            out.add(i)
+            # '**' also matches zero directories
+            while i < n and matchers[i] is None:
+                i += 1
+                out.add(i)
+        return frozenset(out)
+
+    def listdir(dirpath: str, states: FrozenSet[int]) -> List[Tuple[str, str, Optional[os.DirEntry]]]:
+        wanted = {literals[i] for i in states}
+        if None not in wanted:
+            # 只剩字面量段时无需列目录, 直接 stat
+            return [(name, os.path.join(dirpath, name), None) for name in sorted(wanted)]
+        try:
+            with os.scandir(dirpath) as it:
+                listing = [(entry.name, entry.path, entry) for entry in it]
+        except OSError:
+            return []
+        if ".." in wanted:
+            # scandir never lists '..'
+            listing.append(("..", os.path.join(dirpath, ".."), None))
+        listing.sort(key=lambda item: item[0])
+        return listing
+
+    def kind(path: str, entry: Optional[os.DirEntry]) -> Tuple[bool, bool, bool]:
+        if entry is not None:
+            return entry.is_dir(), entry.is_file(), entry.is_symlink()
+        st = os.lstat(path)
+        is_link = stat.S_ISLNK(st.st_mode)
+        if is_link:
+            st = os.stat(path)
+        return stat.S_ISDIR(st.st_mode), stat.S_ISREG(st.st_mode), is_link
+
+    active = closure({0})
+    if n in active:
+        yield base, True, False
+        active = active - {n}
+
+    stack = [(active, iter(listdir(base, active)))] if active else []
+    while stack:
+        states, entries = stack[-1]
+        item = next(entries, None)
+        if item is None:
+            stack.pop()
+            continue
+        name, path, entry = item
+        hidden = not show_hidden and name.startswith(".")
+
+        reached = set()
+        recursive = []
+        for i in states:
+            if matchers[i] is None:
+                if not hidden:
+                    recursive.append(i)
+            elif (not hidden or literals[i] is not None) and matchers[i](name):
+                reached.add(i + 1)
+        if not reached and not recursive:
+            continue
+
+        try:
+            is_dir, is_file, is_link = kind(path, entry)
+        except OSError:
+            continue
+
+        if not is_dir:
+            if n in reached and not dirs_only:
+                yield path, False, is_file
+            continue
+
+        if not is_link:
+            reached.update(recursive)
+        reached = closure(reached)
+        if n in reached:
+            yield path, True, is_file
+            reached = reached - {n}
+        if reached:
+            stack.append((reached, iter(listdir(path, reached))))
+
+
 class GlobTool(BaseTool):
     """
     Find files and directories matching glob patterns.
@@ -87,13 +204,16 @@ Examples: '*.py', 'src/**/*.js', 'test_*.py'"""
             Formatted string with matching paths
         """
         try:
+            root = Config.ROOT_PATH
+            root_prefix = os.path.join(root, "")
+
             # Determine base path
             if path:
                 base_path = Path(path)
                 if not base_path.is_absolute():
-                    base_path = Path(Config.ROOT_PATH) / path
+                    base_path = Path(root) / path
             else:
-                base_path = Path(Config.ROOT_PATH)
+                base_path = Path(root)
 
             if not base_path.exists():
                 return f"Error: Path '{base_path}' does not exist."
@@ -101,27 +221,16 @@ Examples: '*.py', 'src/**/*.js', 'test_*.py'"""
             if not base_path.is_dir():
                 return f"Error: Path '{base_path}' is not a directory."
 
-            # Determine if recursive pattern
-            if "**" in pattern:
-                matches = base_path.glob(pattern)
-            else:
-                # For non-recursive, search from base_path
-                matches = base_path.glob(pattern)
-
-            # Filter and collect results
-            results: List[Path] = []
-            for match in matches:
-                # Skip hidden files unless requested
-                if not show_hidden and any(part.startswith(".") for part in match.parts):
-                    continue
-
+            # Filter and collect results; the walk stops as soon as the cap is hit
+            results: List[Tuple[str, bool]] = []
+            for match, is_dir, is_file in _glob_walk(str(base_path), pattern, show_hidden):
                 # Filter by type
-                if type == "file" and not match.is_file():
+                if type == "file" and not is_file:
                     continue
-                if type == "dir" and not match.is_dir():
+                if type == "dir" and not is_dir:
                     continue
 
-                results.append(match)
+                results.append((match, is_dir))
 
                 # Respect max results
                 if len(results) >= max_results:
@@ -131,22 +240,21 @@ Examples: '*.py', 'src/**/*.js', 'test_*.py'"""
             if not results:
                 return f"No matches found for pattern '{pattern}' in {base_path}"
 
-            # Sort results for consistent output
-            results.sort()
+            # _glob_walk already yields in sorted order
 
             output = [f"Found {len(results)} match(es) for '{pattern}':\n"]
             
-            for result in results:
-                try:
-                    # Try to show relative path
-                    rel_path = result.relative_to(Config.ROOT_PATH)
-                    display_path = str(rel_path)
-                except ValueError:
-                    # If not relative to workspace, show full path
-                    display_path = str(result)
+            for result, is_dir in results:
+                # Show paths relative to the workspace, full path otherwise
+                if result.startswith(root_prefix):
+                    display_path = result[len(root_prefix):]
+                elif result == root:
+                    display_path = "."
+                else:
+                    display_path = result
 
                 # Add type indicator
-                if result.is_dir():
+                if is_dir:
                     display_path += "/"
                 
                 output.append(f"  {display_path}")
@@ -4,13 +4,129 @@ Grep Tool - Search for patterns in files
 
 import os
 import re
-from typing import Dict, Any, Optional, List
+import mmap
+import fnmatch
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Callable, Iterator
 from pathlib import Path
 
 from backend.tools.base import BaseTool
 from backend.infra.config import Config
 from backend.llm.decorators import schema_strict_validator
 
+# Common binary and generated files: skipped by extension or by any
+# directory component; both are plain set lookups.
+_SKIP_EXTS = frozenset({
+    ".pyc", ".so", ".dylib", ".dll", ".exe", ".bin", ".class",
+    ".jpg", ".jpeg", ".png", ".gif", ".pdf", ".zip", ".tar", ".gz",
+})
+_SKIP_DIRS = frozenset({".git", "__pycache__", "node_modules", ".venv", "venv"})
+
+# Files are read in parallel (open/read release the GIL); batches keep the walk
+# lazy so that reaching max_results stops it early.
+_SEARCH_WORKERS = min(8, os.cpu_count() or 4)
+_SEARCH_BATCH = 64
+
+# Binary sniffing: a NUL byte, or too many control bytes, in the first block.
+# Bytes >= 0x80 count as text so UTF-8 (e.g. Chinese) files are not rejected.
+_SNIFF_SIZE = 512
+_MMAP_MIN_SIZE = 64 * 1024
+# Directory searches skip files larger than this (logs, dumps, minified bundles);
+# a file passed explicitly as 'path' is always searched.
+_MAX_FILE_BYTES = 2 * 1024 * 1024
+_TEXT_BYTES = bytes({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x7F)) | set(range(0x80, 0x100)))
+
+
+def _looks_binary(head: bytes) -> bool:
+    if not head:
+        return False
+    if b"\x00" in head:
+        return True
+    return len(head.translate(None, _TEXT_BYTES)) > len(head) * 0.3
+
+
+# Constructs whose result depends on where a line starts/ends, or that cannot
+# give back a newline they consumed (possessive quantifiers, atomic groups);
+# such patterns cannot be located on the whole buffer and are matched line by line.
+_LINE_LOCAL = re.compile(r"\\[AZ]|\(\?<?[=!]|\(\?>|[*+?}]\+")
+
+
+@functools.lru_cache(maxsize=128)
+def _compile(pattern: str, case_sensitive: bool) -> re.Pattern:
+    return re.compile(pattern, 0 if case_sensitive else re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=32)
+def _buffer_regex(regex: re.Pattern) -> Optional[re.Pattern]:
+    """Multiline twin of *regex* used to locate candidate lines in a whole file buffer."""
+    if _LINE_LOCAL.search(regex.pattern):
+        return None
+    return re.compile(regex.pattern, regex.flags | re.MULTILINE)
+
+
+def _file_pattern_matcher(file_pattern: str) -> Callable[[str], bool]:
+    """
+    Compile *file_pattern* once into a predicate over path strings.
+
+    Same semantics as Path.match: segments are matched against the trailing
+    path components, case-insensitively only on Windows.
+    """
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    anchored = os.path.isabs(file_pattern)
+    segments = [
+        re.compile(fnmatch.translate(seg), flags).match
+        for seg in re.split(r"[\\/]", file_pattern) if seg
+    ]
+    if len(segments) == 1 and not anchored:
+        only = segments[0]
+        return lambda path_str: only(os.path.basename(path_str)) is not None
+
+    def match(path_str: str) -> bool:
+        parts = path_str.split(os.sep)
+        if len(parts) < len(segments) or (anchored and len(parts) - 1 != len(segments)):
+            return False
+        return all(seg(part) for seg, part in zip(segments, parts[-len(segments):]))
+
+    return match
+
+
+def _iter_files(root: str, recursive: bool) -> Iterator[str]:
+    """
+    Yield regular files under *root* in path order, using DirEntry's cached type.
+
+    Like Path.rglob, symlinked files are included but symlinked directories are
+    not descended into.
+    """
+    stack = [iter(_sorted_entries(root))]
+    while stack:
+        entry = next(stack[-1], None)
+        if entry is None:
+            stack.pop()
+            continue
+        try:
+            if entry.is_file():
+                yield entry.path
+            elif (
+                recursive
+                and entry.name not in _SKIP_DIRS
+                and entry.is_dir(follow_symlinks=False)
+            ):
+                stack.append(iter(_sorted_entries(entry.path)))
+        except OSError:
+            continue
+
+
+def _sorted_entries(dirpath: str) -> List[os.DirEntry]:
+    try:
+        with os.scandir(dirpath) as it:
+            entries = list(it)
+    except OSError:
+        return []
+    entries.sort(key=lambda e: e.name)
+    return entries
+
 
 class GrepTool(BaseTool):
     """
@@ -95,6 +211,8 @@ Returns file paths and matching line numbers."""
             Formatted string with matching files and line numbers
         """
         try:
+            root_prefix = os.path.join(Config.ROOT_PATH, "")
+
             # Determine search path
             if path:
                 search_path = Path(path)
@@ -107,61 +225,70 @@ Returns file paths and matching line numbers."""
                 return f"Error: Path '{search_path}' does not exist."
 
             # Compile regex pattern
-            flags = 0 if case_sensitive else re.IGNORECASE
             try:
-                regex = re.compile(pattern, flags)
+                regex = _compile(pattern, case_sensitive)
             except re.error as e:
                 return f"Error: Invalid regex pattern: {e}"
 
             results: List[Dict[str, Any]] = []
             files_searched = 0
+            files_too_large = 0
 
             # Search in files
             if search_path.is_file():
                 # Single file search
-                matches = self._search_file(search_path, regex)
+                matches = self._search_file(str(search_path), regex)
                 if matches:
                     results.append({"file": str(search_path), "matches": matches})
                 files_searched = 1
             else:
                 # Directory search
-                pattern_obj = Path(file_pattern) if file_pattern else None
-                
-                if recursive:
-                    file_iter = search_path.rglob("*")
-                else:
-                    file_iter = search_path.glob("*")
-
-                for file_path in file_iter:
-                    if not file_path.is_file():
-                        continue
-
-                    # Filter by file pattern if provided
-                    if pattern_obj and not file_path.match(file_pattern):
-                        continue
-
-                    # Skip binary files and common ignore patterns
-                    if self._should_skip(file_path):
-                        continue
-
-                    files_searched += 1
-                    matches = self._search_file(file_path, regex)
-                    
-                    if matches:
-                        results.append({
-                            "file": str(file_path.relative_to(Config.ROOT_PATH)),
-                            "matches": matches,
-                        })
-
-                    # Respect max results limit
-                    if len(results) >= max_results:
-                        break
+                name_matches = _file_pattern_matcher(file_pattern) if file_pattern else None
+
+                def candidates():
+                    for file_path in _iter_files(str(search_path), recursive):
+                        # Filter by file pattern if provided
+                        if name_matches and not name_matches(file_path):
+                            continue
+
+                        # Skip binary files and common ignore patterns
+                        if self._should_skip(file_path):
+                            continue
+
+                        yield file_path
+
+                pending = candidates()
+                with ThreadPoolExecutor(max_workers=_SEARCH_WORKERS) as pool:
+                    while len(results) < max_results:
+                        batch = list(itertools.islice(pending, _SEARCH_BATCH))
+                        if not batch:
+                            break
+                        found_matches = pool.map(
+                            lambda fp: self._search_file(fp, regex, _MAX_FILE_BYTES), batch
+                        )
+                        for file_path, matches in zip(batch, found_matches):
+                            if matches is None:
+                                files_too_large += 1
+                                continue
+                            files_searched += 1
+                            if matches:
+                                results.append({
+                                    "file": self._display_path(file_path, root_prefix),
+                                    "matches": matches,
+                                })
+
+                            # Respect max results limit
+                            if len(results) >= max_results:
+                                break
 
             # Format results
+            searched = f"searched {files_searched} files"
+            if files_too_large:
+                searched += f", skipped {files_too_large} larger than {_MAX_FILE_BYTES // (1024 * 1024)}MB"
             if not results:
-                return f"No matches found for '{pattern}' (searched {files_searched} files)"
+                return f"No matches found for '{pattern}' ({searched})"
 
-            output = [f"Found {len(results)} file(s) with matches (searched {files_searched} files):\n"]
+            output = [f"Found {len(results)} file(s) with matches ({searched}):\n"]
             
             for result in results[:max_results]:
                 file_path = result["file"]
@@ -184,33 +311,93 @@ Returns file paths and matching line numbers."""
         except Exception as e:
             return f"Error during grep: {e}"
 
-    def _search_file(self, file_path: Path, regex: re.Pattern) -> List[tuple]:
+    @staticmethod
+    def _display_path(file_path: str, root_prefix: str) -> str:
+        """Path relative to the workspace root, or unchanged when outside it."""
+        if file_path.startswith(root_prefix):
+            return file_path[len(root_prefix):]
+        return file_path
+
+    def _search_file(
+        self, file_path: str, regex: re.Pattern, max_bytes: Optional[int] = None
+    ) -> Optional[List[tuple]]:
         """
         Search for pattern in a single file.
 
         Returns:
-            List of (line_number, line_content) tuples
+            List of (line_number, line_content) tuples, or None when the file
+            is larger than max_bytes and was not read
         """
         matches = []
         try:
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                for line_num, line in enumerate(f, start=1):
-                    line = line.rstrip("\n\r")
-                    if regex.search(line):
-                        matches.append((line_num, line))
-        except (UnicodeDecodeError, PermissionError):
+            with open(file_path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if max_bytes is not None and size > max_bytes:
+                    return None
+                head = f.read(_SNIFF_SIZE)
+                if _looks_binary(head):
+                    return matches
+                data = self._read_text(f, head, size)
+        except PermissionError:
             # Skip files that can't be read
-            pass
+            return matches
+
+        if "\r" in data:
+            # Same universal-newline handling as text mode
+            data = data.replace("\r\n", "\n").replace("\r", "\n")
+
+        scan = _buffer_regex(regex)
+        if scan is None:
+            lines = data.split("\n")
+            if lines[-1] == "":
+                lines.pop()
+            for line_num, line in enumerate(lines, start=1):
+                if regex.search(line):
+                    matches.append((line_num, line))
+            return matches
+
+        # Jump between candidate lines on the whole buffer; each candidate is
+        # confirmed with the original per-line search so results stay identical.
+        size = len(data)
+        pos = 0
+        line_num = 1
+        while pos < size:
+            m = scan.search(data, pos)
+            if m is None:
+                break
+            start = data.rfind("\n", 0, m.start()) + 1
+            if start >= size:
+                break
+            line_num += data.count("\n", pos, start)
+            end = data.find("\n", start)
+            if end == -1:
+                end = size
+            line = data[start:end]
+            if regex.search(line):
+                matches.append((line_num, line))
+            pos = end + 1
+            line_num += 1
         return matches
 
-    def _should_skip(self, file_path: Path) -> bool:
+    @staticmethod
+    def _read_text(f, head: bytes, size: int) -> str:
+        """
+        Decode the rest of an open binary file.
+
+        Large files are decoded straight from a read-only mapping, skipping the
+        intermediate bytes copy. The str pattern still does the matching, since
+        a bytes twin would change what '.', '\\w' or IGNORECASE match on non-ASCII.
+        """
+        if size >= _MMAP_MIN_SIZE:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return str(mm, "utf-8", "ignore")
+            except (ValueError, OSError):
+                pass
+        return (head + f.read()).decode("utf-8", errors="ignore")
+
+    def _should_skip(self, file_path: str) -> bool:
         """Check if file should be skipped."""
-        # Skip common binary and generated files
-        skip_patterns = [
-            ".git/", "__pycache__/", "node_modules/", ".venv/", "venv/",
-            ".pyc", ".so", ".dylib", ".dll", ".exe", ".bin", ".class",
-            ".jpg", ".jpeg", ".png", ".gif", ".pdf", ".zip", ".tar", ".gz",
-        ]
-        
-        path_str = str(file_path)
-        return any(pattern in path_str for pattern in skip_patterns)
+        if os.path.splitext(file_path)[1] in _SKIP_EXTS:
+            return True
+        return not _SKIP_DIRS.isdisjoint(file_path.split(os.sep)[:-1])
@@ -1,8 +1,166 @@
 from typing import Dict, Any, Optional
 import os
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
 from backend.tools.base import BaseTool
 from backend.llm.decorators import schema_strict_validator, output_sanitizer
 from backend.infra.environment import Environment
+from backend.infra.config import Config
+
+# Converted text keyed by content hash: an in-memory LRU in front of an on-disk copy,
+# so re-reading the same PDF/DOCX/XLSX skips MarkItDown/pandas entirely
+_CACHE_MAXSIZE = 128
+_HASH_CHUNK = 1 << 20
+# On-disk entries beyond this total are evicted oldest-first
+_DISK_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Only formats that go through a converter are cached; plain text is cheap to re-read
+# and should not leave copies (e.g. of .env files) behind in the cache directory
+_CONVERTED_EXTS = frozenset({".pdf", ".docx", ".pptx", ".xlsx", ".xls", ".epub", ".msg"})
+_cache: "OrderedDict[str, str]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+# Shared MarkItDown converter, built on first use instead of per tool instance
+_markitdown = None
+_markitdown_ready = False
+_markitdown_lock = threading.Lock()
+
+
+def _get_markitdown():
+    global _markitdown, _markitdown_ready
+    if not _markitdown_ready:
+        with _markitdown_lock:
+            if not _markitdown_ready:
+                try:
+                    from markitdown import MarkItDown
+                    _markitdown = MarkItDown()
+                except ImportError:
+                    print("[Warn] MarkItDown not installed, ReadFileTool will only support basic text reading.")
+                _markitdown_ready = True
+    return _markitdown
+
+
+@functools.lru_cache(maxsize=1)
+def _get_pandas():
+    # Also remembers a missing pandas, so .xlsx reads don't rescan sys.path every call
+    try:
+        import pandas
+        return pandas
+    except ImportError:
+        return None
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _df_to_markdown(df) -> str:
+    """
+    Render a DataFrame as a pipe table without going through tabulate.
+
+    tabulate formats and pads every cell in Python, which dominates on wide
+    sheets; an unpadded table is the same markdown to a reader (and fewer tokens).
+    """
+    text = df.astype(str)
+    columns = [str(c) for c in df.columns]
+    if any(("|" in c or "\n" in c) for c in columns) or any(
+        col.str.contains("[|\n]", regex=True).any() for _, col in text.items()
+    ):
+        # Keep embedded pipes/newlines from breaking the table
+        text = text.apply(lambda col: col.str.replace("|", "\\|", regex=False)
+                                         .str.replace("\n", " ", regex=False))
+        columns = [c.replace("|", "\\|").replace("\n", " ") for c in columns]
+    lines = [
+        "| " + " | ".join(columns) + " |",
+        "|" + "|".join(["---"] * len(columns)) + "|",
+    ]
+    lines.extend("| " + " | ".join(row) + " |" for row in text.to_numpy().tolist())
+    return "\n".join(lines)
+
+
+def _cache_dir() -> str:
+    return os.path.join(Config.CACHE_DIR, "readfile")
+
+
+def _cache_file(key: str) -> str:
+    return os.path.join(_cache_dir(), f"{key}.md")
+
+
+def _cache_get(key: str, disk: bool = True) -> Optional[str]:
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit is not None:
+            _cache.move_to_end(key)
+            return hit
+    if not disk:
+        return None
+    path = _cache_file(key)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        # Mark as recently used for eviction
+        os.utime(path)
+    except OSError:
+        return None
+    _cache_put(key, text, persist=False)
+    return text
+
+
+def _cache_put(key: str, text: str, persist: bool = True) -> None:
+    with _cache_lock:
+        _cache[key] = text
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_MAXSIZE:
+            _cache.popitem(last=False)
+    if not persist:
+        return
+    # Best effort: write to a temp file and rename so readers never see a partial entry
+    path = _cache_file(key)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return
+    _prune_disk_cache()
+
+
+def _prune_disk_cache() -> None:
+    """Evict least recently used on-disk entries until the total fits _DISK_CACHE_MAX_BYTES."""
+    try:
+        with os.scandir(_cache_dir()) as it:
+            entries = []
+            for entry in it:
+                if entry.name.endswith(".md"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime_ns, st.st_size, entry.path))
+    except OSError:
+        return
+    total = sum(size for _, size, _ in entries)
+    if total <= _DISK_CACHE_MAX_BYTES:
+        return
+    entries.sort()
+    for _, size, path in entries:
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        if total <= _DISK_CACHE_MAX_BYTES:
+            break
+
 
 class ReadFileTool(BaseTool):
     """
@@ -13,12 +171,10 @@ class ReadFileTool(BaseTool):
     def __init__(self, env: Optional[Environment] = None):
         super().__init__()
         self.env = env
-        try:
-            from markitdown import MarkItDown
-            self.md = MarkItDown()
-        except ImportError:
-            self.md = None
-            print("[Warn] MarkItDown not installed, ReadFileTool will only support basic text reading.")
+
+    @property
+    def md(self):
+        return _get_markitdown()
     
     @property
     def name(self) -> str:
@@ -69,15 +225,29 @@ class ReadFileTool(BaseTool):
             if not self.env.file_exists(file_path):
                 return f"Error: File '{file_path}' not found in environment."
 
-            # Create local temp file to download to
+            # Unchanged size/mtime: serve the cached conversion without downloading.
+            # Metadata alone can miss a same-size rewrite within one mtime tick, so
+            # these hits live only in memory; the disk layer is keyed by content.
             ext = os.path.splitext(file_path)[1]
+            meta_key = self._metadata_key(file_path, ext)
+            if meta_key is not None:
+                cached = _cache_get(meta_key, disk=False)
+                if cached is not None:
+                    return cached
+
+            # Shared filesystem: convert the file in place, no temp copy
+            local = self.env.local_path(file_path)
+            if local is not None and os.access(local, os.R_OK):
+                return self._process_local_file(local, meta_key=meta_key)
+
+            # Create local temp file to download to
             with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
                 local_tmp_path = tmp.name
             
             # Download
             if self.env.download_file(file_path, local_tmp_path):
                 # Convert/Read locally
-                return self._process_local_file(local_tmp_path)
+                return self._process_local_file(local_tmp_path, meta_key=meta_key)
             else:
                 return f"Error: Failed to download file '{file_path}' for processing."
                 
@@ -88,25 +258,69 @@ class ReadFileTool(BaseTool):
             if 'local_tmp_path' in locals() and os.path.exists(local_tmp_path):
                 os.remove(local_tmp_path)
 
-    def _process_local_file(self, local_path: str) -> str:
+    def _cache_mode(self, ext: str) -> Optional[str]:
+        """Cache key component; None when the read needs no conversion and is not cached."""
+        ext = ext.lower()
+        if ext not in _CONVERTED_EXTS:
+            return None
+        # Output also depends on whether MarkItDown is available
+        if self.md is not None:
+            return "md"
+        return "raw" if ext == ".xlsx" else None
+
+    def _metadata_key(self, file_path: str, ext: str) -> Optional[str]:
+        """In-memory cache key from env.stat() metadata, so a hit needs neither download nor hashing."""
+        mode = self._cache_mode(ext)
+        meta = self.env.stat(file_path) if mode else None
+        if meta is None:
+            return None
+        size, mtime_ns = meta
+        ident = f"{type(self.env).__name__}|{self.env.workdir}|{file_path}|{size}|{mtime_ns}"
+        return f"{hashlib.sha256(ident.encode('utf-8')).hexdigest()}-{mode}{ext.lower()}"
+
+    def _process_local_file(self, local_path: str, meta_key: Optional[str] = None) -> str:
+        ext = os.path.splitext(local_path)[1].lower()
+        mode = self._cache_mode(ext)
+        if mode is None:
+            # Plain text read, nothing worth caching
+            return self._convert_local_file(local_path)
+        try:
+            cache_key = f"{_file_digest(local_path)}-{mode}{ext}"
+        except OSError:
+            return self._convert_local_file(local_path)
+
+        text = _cache_get(cache_key)
+        if text is None:
+            text = self._convert_local_file(local_path)
+            if text.startswith("Error"):
+                return text
+            _cache_put(cache_key, text)
+        if meta_key is not None:
+            _cache_put(meta_key, text, persist=False)
+        return text
+
+    def _convert_local_file(self, local_path: str) -> str:
         # Reuse old logic but on local path
         ext = os.path.splitext(local_path)[1].lower()
 
         # Excel Handling
-        if ext == ".xlsx":
+        pd = _get_pandas() if ext == ".xlsx" else None
+        if pd is not None:
             try:
-                import pandas as pd
-                sheets_dict = pd.read_excel(local_path, sheet_name=None, engine='openpyxl')
-                if sheets_dict:
-                    output = []
-                    for sheet_name, df in sheets_dict.items():
-                        output.append(f"### Sheet: {sheet_name}\n")
-                        try:
-                            output.append(df.to_markdown(index=False))
-                        except Exception:
-                            output.append(df.to_string(index=False))
-                        output.append("\n")
-                    return "\n".join(output)
+                # One workbook handle, one sheet in memory at a time
+                with pd.ExcelFile(local_path, engine='openpyxl') as xl:
+                    if xl.sheet_names:
+                        output = []
+                        for sheet_name in xl.sheet_names:
+                            df = xl.parse(sheet_name)
+                            output.append(f"### Sheet: {sheet_name}\n")
+                            try:
+                                output.append(_df_to_markdown(df))
+                            except Exception:
+                                output.append(df.to_string(index=False))
+                            output.append("\n")
+                            del df
+                        return "\n".join(output)
             except Exception:
                 pass
 
@@ -15,11 +15,52 @@
 """
 
 import json
-from typing import Dict, Any, List, Callable, Optional
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Callable, Optional, Tuple
 from backend.tools.base import BaseTool
 from backend.infra.environment import Environment
 from backend.infra.envs import E2BEnvironment, DockerEnvironment
 from backend.llm.decorators import schema_strict_validator
+from backend.llm.types import AgentSpec
+
+
+# (agent, environment, workdir, sha256(query), files) -> (finished_at, result); LRU with TTL
+# 规划器重试/循环时常以相同 query 重复委派, 命中则跳过建环境和整段子会话
+_CACHE_TTL = 600.0
+_CACHE_MAXSIZE = 256
+_cache: "OrderedDict[Tuple, Tuple[float, str]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+# 只有工具全部无副作用的代理才缓存: bash/write/edit/browser 或嵌套代理会改动工作区,
+# 重复委派必须真正重跑
+_CACHEABLE_TOOLS = frozenset({
+    "read_file", "glob", "grep", "web_reader", "web_search", "arxiv_search", "activate_skill",
+})
+
+
+def _cache_get(key: Tuple) -> Optional[str]:
+    now = time.monotonic()
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit is None:
+            return None
+        if now - hit[0] >= _CACHE_TTL:
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        return hit[1]
+
+
+def _cache_put(key: Tuple, result: str) -> None:
+    with _cache_lock:
+        _cache[key] = (time.monotonic(), result)
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_MAXSIZE:
+            _cache.popitem(last=False)
+
 
 class AgentTool(BaseTool):
     """
@@ -30,7 +71,7 @@ class AgentTool(BaseTool):
     
     支持 'target_environment' 参数，用于实现 Main Agent(Local) -> Sub Agent(Remote) 模式。
     """
-    def __init__(self, agent_data: Dict[str, Any], engine_factory: Callable, tool_registry: Any, 
+    def __init__(self, agent_data: AgentSpec, engine_factory: Callable, tool_registry: Any, 
                  agent_registry: Any = None, skill_registry: Any = None, 
                  current_env: Optional[Environment] = None):
         """
@@ -54,12 +95,12 @@ class AgentTool(BaseTool):
     @property
     def name(self) -> str:
         """返回代理名称"""
-        return self.agent_data["name"]
+        return self.agent_data.name
 
     @property
     def description(self) -> str:
         """返回代理描述，附带 [AGENT] 前缀以便 LLM 区分"""
-        base_desc = self.agent_data.get('description', '')
+        base_desc = self.agent_data.description
         # 如果这是一个通用任务代理，明确说明它可以在隔离环境中运行
         if "general" in self.name or "task" in self.name:
             base_desc += " Can execute tasks in isolated environments (e2b/docker)."
@@ -68,7 +109,7 @@ class AgentTool(BaseTool):
     @property
     def parameters_schema(self) -> Dict[str, Any]:
         """
-        所有子代理工具接受 'query' 和可选的 'environment'、'files_to_transfer' 参数
+        所有子代理工具接受 'query' 和可选的 'environment'、'files_to_transfer'、'force_refresh' 参数
         """
         return {
             "type": "object",
@@ -87,6 +128,11 @@ class AgentTool(BaseTool):
                     "type": "array",
                     "items": {"type": "string"},
                     "description": "List of absolute file paths in the current environment to transfer to the target environment before execution."
+                },
+                "force_refresh": {
+                    "type": "boolean",
+                    "description": "Re-run the subagent even if an identical recent request has a cached result.",
+                    "default": False
                 }
             },
             "required": ["query"]
@@ -101,8 +147,36 @@ class AgentTool(BaseTool):
         env = kwargs.get('environment', 'inherit')
         return f"\n\n🤖 正在委派任务给子代理: {self.name} (Env: {env})...\n"
     
+    def _transfer_one(self, file_path: str, target_env: Environment) -> Optional[str]:
+        """
+        将单个文件从当前环境复制到目标环境的工作目录。
+
+        Returns:
+            None 表示成功，否则为错误信息
+        """
+        import tempfile
+        import os
+        file_name = os.path.basename(file_path)
+        try:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                local_tmp_path = os.path.join(tmpdir, file_name)
+                # Step A: 从源环境下载
+                if self.current_env.file_exists(file_path):
+                    if not self.current_env.download_file(file_path, local_tmp_path):
+                        return f"Error: Failed to download file '{file_path}'."
+                else:
+                    return f"Error: File '{file_path}' not found."
+                # Step B: 上传到目标环境
+                target_remote_path = f"{target_env.workdir}/{file_name}"
+                if not target_env.upload_file(local_tmp_path, target_remote_path):
+                    return f"Error: Failed to upload file '{file_path}'."
+        except Exception as e:
+            return f"Error during file transfer: {e}"
+        return None
+
     @schema_strict_validator
-    def execute(self, query: str, environment: str = "default", files_to_transfer: List[str] = None) -> str:
+    def execute(self, query: str, environment: str = "default", files_to_transfer: List[str] = None,
+                force_refresh: bool = False) -> str:
         """
         执行子代理任务，支持动态环境切换和文件传输。
         
@@ -110,6 +184,7 @@ class AgentTool(BaseTool):
             query: 任务描述
             environment: 目标运行环境 (default/inherit/local/e2b/docker)
             files_to_transfer: 需要传输到目标环境的文件列表（绝对路径）
+            force_refresh: 忽略缓存的结果，重新执行子代理
             
         Returns:
             子代理执行结果摘要
@@ -121,6 +196,20 @@ class AgentTool(BaseTool):
         if environment == "default":
             environment = "inherit"
 
+        # 相同代理 + 环境 + 任务 + 文件 的近期结果直接复用 (仅限只读代理)
+        cacheable = _CACHEABLE_TOOLS.issuperset(self.agent_data.allowed_tools)
+        cache_key = (
+            self.name,
+            environment,
+            getattr(self.current_env, "workdir", None),
+            hashlib.sha256(query.encode("utf-8")).hexdigest(),
+            frozenset(files_to_transfer or ()),
+        )
+        if cacheable and not force_refresh:
+            cached = _cache_get(cache_key)
+            if cached is not None:
+                return cached
+
         # 1. 决定目标环境
         try:
             if environment == "inherit":
@@ -159,31 +248,36 @@ class AgentTool(BaseTool):
 
             # 2. 文件传输 (跨环境文件同步)
             if created_new_env and files_to_transfer and self.current_env:
-                import tempfile
                 import os
-                for file_path in files_to_transfer:
-                    file_name = os.path.basename(file_path)
-                    try:
-                        with tempfile.TemporaryDirectory() as tmpdir:
-                            local_tmp_path = os.path.join(tmpdir, file_name)
-                            # Step A: 从源环境下载
-                            if self.current_env.file_exists(file_path):
-                                if not self.current_env.download_file(file_path, local_tmp_path):
-                                    return f"Error: Failed to download file '{file_path}'."
-                            else:
-                                return f"Error: File '{file_path}' not found."
-                            # Step B: 上传到目标环境
-                            target_remote_path = f"{target_env.workdir}/{file_name}"
-                            if not target_env.upload_file(local_tmp_path, target_remote_path):
-                                return f"Error: Failed to upload file '{file_path}'."
-                    except Exception as e:
-                        return f"Error during file transfer: {e}"
+                # 文件都上传到 workdir/<basename>: 重复路径去重, 不同路径同名则拒绝,
+                # 否则并发上传会争抢同一目标文件
+                transfers = list(dict.fromkeys(files_to_transfer))
+                seen = {}
+                for fp in transfers:
+                    base = os.path.basename(fp)
+                    if base in seen:
+                        return (f"Error: Files '{seen[base]}' and '{fp}' would both be transferred "
+                                f"to '{target_env.workdir}/{base}'. Rename one of them first.")
+                    seen[base] = fp
+
+                # 各文件互不依赖, 并发执行 下载→上传 以重叠网络往返
+                if len(transfers) == 1:
+                    errors = [self._transfer_one(transfers[0], target_env)]
+                else:
+                    from concurrent.futures import ThreadPoolExecutor
+                    with ThreadPoolExecutor(max_workers=min(8, len(transfers))) as pool:
+                        errors = list(pool.map(lambda fp: self._transfer_one(fp, target_env),
+                                               transfers))
+                # 按输入顺序报告第一个错误
+                for err in errors:
+                    if err:
+                        return err
 
             # 3. 创建并配置子引擎
             # 从 tool_registry 为子代理创建工具，注入 target_env
             resolved_tools = []
             if self.tool_registry:
-                 allowed = self.agent_data.get("allowed_tools", [])
+                 allowed = self.agent_data.allowed_tools
                  for t_name in allowed:
                      t = self.tool_registry.create_tool(t_name, context={"env": target_env})
                      if t:
@@ -193,7 +287,7 @@ class AgentTool(BaseTool):
             from backend.llm.types import SystemPromptConfig
             
             # 准备 SystemPrompt
-            system_config = SystemPromptConfig(base_prompt=self.agent_data["instructions"])
+            system_config = SystemPromptConfig(base_prompt=self.agent_data.instructions)
             
             # 注入环境上下文到 Prompt
             prompt_cwd = target_env.workdir
@@ -210,7 +304,7 @@ class AgentTool(BaseTool):
                  agent_registry=self.agent_registry,
                  tool_registry=self.tool_registry,
                  skill_registry=self.skill_registry,
-                 provider_key=self.agent_data.get("model")
+                 provider_key=self.agent_data.model
             )
             
             # 4. 运行子 Agent 会话并收集结果
@@ -222,18 +316,26 @@ class AgentTool(BaseTool):
             
             # iterate stream
             final_history = []
+            failed = False
             for event in sub_engine.run(messages=current_messages, system_config=system_config):
                 if event.type == "finish":
                     final_history = event.data["history"]
+                elif event.type == "error":
+                    # 例如达到迭代上限: 结果不完整, 不能缓存
+                    failed = True
             
+            result = "Task completed (no output)."
             if final_history:
                 last_msg = final_history[-1]
                 if last_msg["role"] == "assistant":
-                    return str(last_msg["content"])
+                    result = str(last_msg["content"])
                 elif last_msg["role"] == "tool": # 可能是最后一步是工具结果
-                    return str(last_msg["content"])
-            
-            return "Task completed (no output)."
+                    result = str(last_msg["content"])
+
+            # 出错的运行, 以及新建环境并传入了文件的运行 (依赖那份状态) 不缓存
+            if cacheable and not failed and not (created_new_env and files_to_transfer):
+                _cache_put(cache_key, result)
+            return result
             
         except Exception as e:
             import traceback
@@ -9,16 +9,82 @@
     - JinaWebReaderTool: 基于 Jina Reader API 的旧实现（backup）
 """
 
+import os
 import re
+import json
+import time
+import sqlite3
+import functools
 import requests
-from typing import Dict, Any
+from contextlib import closing
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Optional, Tuple
 from backend.tools.base import BaseTool
 from backend.llm.decorators import schema_strict_validator
 from backend.infra.config import Config
 from backend.utils.logger import Logger
 
+# Optional C-backed HTML parsing: selectolax (lexbor) for plain-text extraction
+# when installed, and bs4 on top of lxml rather than the pure-Python
+# html.parser when available (markdown conversion always goes through bs4).
+try:
+    from selectolax.parser import HTMLParser as _FastHTMLParser
+except ImportError:
+    _FastHTMLParser = None
+
+try:
+    import lxml  # noqa: F401
+    _BS4_FEATURES = "lxml"
+except ImportError:
+    _BS4_FEATURES = "html.parser"
+
 MAX_RESPONSE_SIZE = 5 * 1024 * 1024  # 5MB
 DEFAULT_TIMEOUT = 30
+_READ_CHUNK = 64 * 1024
+_URL_RE = re.compile(r"^https?://", re.ASCII)
+
+# Shared keep-alive pool: repeated fetches reuse TCP/TLS connections per host
+_ADAPTER = HTTPAdapter(pool_connections=8, pool_maxsize=32)
+
+
+def _new_session() -> requests.Session:
+    """
+    Session for a single fetch, on top of the shared connection pool.
+
+    Its cookie jar keeps cookies set along a redirect chain and is dropped
+    with the session, so nothing carries over to other (possibly concurrent)
+    fetches - as with a bare requests.get. Never close() it: that would
+    close the shared adapter.
+    """
+    session = requests.Session()
+    session.mount("http://", _ADAPTER)
+    session.mount("https://", _ADAPTER)
+    return session
+
+# 噪音标签与 markdownify 选项, 模块加载时构建一次
+_NOISE_TAGS_MD = ("script", "style", "noscript", "iframe", "object", "embed", "meta", "link")
+_NOISE_TAGS_TXT = ("script", "style", "noscript", "iframe")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_MARKDOWNIFY_OPTIONS = {
+    "heading_style": "ATX",
+    "bullets": "-",
+    "code_language": "",
+    "strip": ["img"],
+}
+# 二进制类型直接拒绝, 不下载也不解码
+_BINARY_MIME_PREFIXES = ("image/", "audio/", "video/", "font/")
+_BINARY_MIME_TYPES = frozenset({
+    "application/pdf",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-tar",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/vnd.rar",
+    "application/wasm",
+})
+_HTML_MIME_TYPES = frozenset({"text/html", "application/xhtml+xml"})
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
     "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -26,35 +92,139 @@ USER_AGENT = (
 )
 
 
-def _html_to_markdown(html: str) -> str:
-    """HTML → Markdown，去除 script/style 等噪音标签。"""
+@functools.lru_cache(maxsize=1)
+def _beautiful_soup():
     from bs4 import BeautifulSoup
-    import markdownify
+    return BeautifulSoup
+
+
+@functools.lru_cache(maxsize=1)
+def _markdown_converter():
+    from markdownify import MarkdownConverter
+    return MarkdownConverter(**_MARKDOWNIFY_OPTIONS)
+
+
+def _format_json(text: str) -> str:
+    """Pretty-print a JSON body; malformed JSON is returned untouched."""
+    try:
+        return json.dumps(json.loads(text), indent=2, ensure_ascii=False)
+    except ValueError:
+        return text
+
+
+def _is_binary_mime(mime: str) -> bool:
+    return mime in _BINARY_MIME_TYPES or mime.startswith(_BINARY_MIME_PREFIXES)
+
+
+def _decode_body(resp: requests.Response, body: bytes) -> str:
+    """Decode a streamed body the way resp.text would (header charset, else detection)."""
+    encoding = resp.encoding
+    if encoding is None:
+        from requests.compat import chardet
+        encoding = chardet.detect(bytes(body))["encoding"] or "utf-8"
+    try:
+        return str(body, encoding, errors="replace")
+    except LookupError:
+        return str(body, "utf-8", errors="replace")
 
-    soup = BeautifulSoup(html, "html.parser")
+
+class _PageCache:
+    """
+    Converted pages keyed by (url, format), persisted in SQLite under Config.CACHE_DIR.
+
+    Entries carrying ETag / Last-Modified are revalidated with a conditional
+    request (a 304 skips both the body download and the HTML conversion);
+    entries without validators are served as-is for TTL seconds.
+    Any SQLite failure just disables caching for that call.
+    """
+
+    TTL = 3600.0
+    MAX_ENTRIES = 256
+
+    def __init__(self, path: str):
+        self.path = path
+        self._ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._ready:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        if not self._ready:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                " url TEXT NOT NULL, format TEXT NOT NULL,"
+                " etag TEXT, last_modified TEXT, body TEXT NOT NULL, fetched_at REAL NOT NULL,"
+                " PRIMARY KEY (url, format))"
+            )
+            self._ready = True
+        return conn
+
+    def get(self, url: str, fmt: str) -> Optional[Tuple[Optional[str], Optional[str], str, float]]:
+        try:
+            with closing(self._connect()) as conn:
+                return conn.execute(
+                    "SELECT etag, last_modified, body, fetched_at FROM pages WHERE url = ? AND format = ?",
+                    (url, fmt),
+                ).fetchone()
+        except (sqlite3.Error, OSError):
+            return None
+
+    def put(self, url: str, fmt: str, etag: Optional[str], last_modified: Optional[str], body: str) -> None:
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, fmt, etag, last_modified, body, time.time()),
+                )
+                conn.execute(
+                    "DELETE FROM pages WHERE rowid NOT IN "
+                    "(SELECT rowid FROM pages ORDER BY fetched_at DESC LIMIT ?)",
+                    (self.MAX_ENTRIES,),
+                )
+        except (sqlite3.Error, OSError):
+            pass
+
+    def touch(self, url: str, fmt: str) -> None:
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "UPDATE pages SET fetched_at = ? WHERE url = ? AND format = ?",
+                    (time.time(), url, fmt),
+                )
+        except (sqlite3.Error, OSError):
+            pass
+
+
+_page_cache = _PageCache(os.path.join(Config.CACHE_DIR, "web_reader.sqlite3"))
+
+
+def _html_to_markdown(html: str) -> str:
+    """HTML → Markdown，去除 script/style 等噪音标签。"""
+    # 始终走 bs4: markdownify 需要 bs4 树, 先用 selectolax 解析再序列化只会多一遍解析
+    soup = _beautiful_soup()(html, _BS4_FEATURES)
     # 移除噪音标签
-    for tag in soup.find_all(["script", "style", "noscript", "iframe",
-                              "object", "embed", "meta", "link"]):
+    for tag in soup.find_all(_NOISE_TAGS_MD):
         tag.decompose()
-    cleaned = str(soup)
-    md = markdownify.markdownify(
-        cleaned,
-        heading_style="ATX",
-        bullets="-",
-        code_language="",
-        strip=["img"],
-    )
+    # 直接转换已解析的树, 省去 str(soup) 序列化和 markdownify 的二次解析
+    md = _markdown_converter().convert_soup(soup)
     # 压缩连续空行
-    md = re.sub(r'\n{3,}', '\n\n', md)
+    md = _BLANK_LINES_RE.sub("\n\n", md)
     return md.strip()
 
 
 def _extract_text(html: str) -> str:
     """HTML → 纯文本。"""
-    from bs4 import BeautifulSoup
-
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup.find_all(["script", "style", "noscript", "iframe"]):
+    if _FastHTMLParser is not None:
+        tree = _FastHTMLParser(html)
+        tree.strip_tags(list(_NOISE_TAGS_TXT))
+        if tree.root is None:
+            return ""
+        text = tree.root.text(separator="\n", strip=True)
+        # 与 bs4 get_text(strip=True) 一致: 丢弃空白文本节点留下的空行
+        return "\n".join(line for line in text.split("\n") if line)
+
+    soup = _beautiful_soup()(html, _BS4_FEATURES)
+    for tag in soup.find_all(_NOISE_TAGS_TXT):
         tag.decompose()
     return soup.get_text(separator="\n", strip=True)
 
@@ -63,7 +233,7 @@ class WebReaderTool(BaseTool):
     """网页内容读取工具 — 原生 HTTP fetch + HTML→Markdown 转换。
 
     参考 opencode webfetch 实现：
-    - 直接 requests.get 抓取页面
+    - 共享 requests.Session 抓取页面（连接复用）
     - 用 markdownify 将 HTML 转为 Markdown
     - 支持 markdown / text / html 三种输出格式
     - Cloudflare 403 自动重试（换 UA）
@@ -106,7 +276,7 @@ class WebReaderTool(BaseTool):
 
     @schema_strict_validator
     def execute(self, url: str, format: str = "markdown") -> str:
-        if not url.startswith("http"):
+        if not _URL_RE.match(url):
             return "Error: URL must start with http:// or https://"
 
         headers = {
@@ -115,8 +285,22 @@ class WebReaderTool(BaseTool):
             "Accept-Language": "en-US,en;q=0.9",
         }
 
+        cached = _page_cache.get(url, format)
+        if cached is not None:
+            etag, last_modified, body, fetched_at = cached
+            if etag or last_modified:
+                # 条件请求: 未变化时服务器返回 304, 直接复用已转换内容
+                if etag:
+                    headers["If-None-Match"] = etag
+                if last_modified:
+                    headers["If-Modified-Since"] = last_modified
+            elif time.time() - fetched_at < _PageCache.TTL:
+                return body
+
+        resp = None
+        session = _new_session()
         try:
-            resp = requests.get(url, headers=headers, timeout=DEFAULT_TIMEOUT,
+            resp = session.get(url, headers=headers, timeout=DEFAULT_TIMEOUT,
                                 stream=True, allow_redirects=True)
 
             # Cloudflare bot detection — retry with honest UA
@@ -125,9 +309,14 @@ class WebReaderTool(BaseTool):
                 if "challenge" in cf.lower():
                     Logger.info("Cloudflare challenge detected, retrying with plain UA")
                     headers["User-Agent"] = "nano-agent-team/web_reader"
-                    resp = requests.get(url, headers=headers, timeout=DEFAULT_TIMEOUT,
+                    resp.close()
+                    resp = session.get(url, headers=headers, timeout=DEFAULT_TIMEOUT,
                                         stream=True, allow_redirects=True)
 
+            if resp.status_code == 304 and cached is not None:
+                _page_cache.touch(url, format)
+                return cached[2]
+
             resp.raise_for_status()
 
             # 检查大小
@@ -135,19 +324,32 @@ class WebReaderTool(BaseTool):
             if cl and int(cl) > MAX_RESPONSE_SIZE:
                 return f"Error: Response too large ({cl} bytes, limit {MAX_RESPONSE_SIZE})"
 
-            content = resp.text
-            if len(content.encode("utf-8", errors="ignore")) > MAX_RESPONSE_SIZE:
-                return "Error: Response body exceeds 5MB limit"
+            # 响应头到达后先看 Content-Type: 二进制内容不读取 body
+            mime = resp.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+            if _is_binary_mime(mime):
+                return f"Error: Unsupported content type '{mime}' (binary content is not read)"
 
-            content_type = resp.headers.get("content-type", "")
-            is_html = "text/html" in content_type or "xhtml" in content_type
+            # 流式读取: 超过上限立即中止, 不必先把整个响应解码成字符串
+            body = bytearray()
+            for chunk in resp.iter_content(chunk_size=_READ_CHUNK):
+                body += chunk
+                if len(body) > MAX_RESPONSE_SIZE:
+                    return "Error: Response body exceeds 5MB limit"
+            content = _decode_body(resp, body)
 
+            # 只有 HTML 才走解析/转换; JSON 美化输出, 其余文本原样返回
             if format == "html":
-                return content
-            elif format == "text":
-                return _extract_text(content) if is_html else content
-            else:  # markdown (default)
-                return _html_to_markdown(content) if is_html else content
+                result = content
+            elif mime in _HTML_MIME_TYPES:
+                result = _extract_text(content) if format == "text" else _html_to_markdown(content)
+            elif mime == "application/json" or mime.endswith("+json"):
+                result = _format_json(content)
+            else:
+                result = content
+
+            _page_cache.put(url, format, resp.headers.get("ETag"),
+                            resp.headers.get("Last-Modified"), result)
+            return result
 
         except requests.exceptions.Timeout:
             return f"Error: Request timed out after {DEFAULT_TIMEOUT}s"
@@ -155,6 +357,10 @@ class WebReaderTool(BaseTool):
             return f"Error: HTTP {e.response.status_code if e.response else '?'} - {e}"
         except Exception as e:
             return f"Error: {str(e)}"
+        finally:
+            # Hand the connection back to the pool (or drop it if the body was not drained)
+            if resp is not None:
+                resp.close()
 
 
 # ---------------------------------------------------------------------------
@@ -199,7 +405,7 @@ class JinaWebReaderTool(BaseTool):
 
     @schema_strict_validator
     def execute(self, url: str) -> str:
-        if not url.startswith("http"):
+        if not _URL_RE.match(url):
             return "Error: Invalid URL. URL must start with http or https."
 
         target_url = f"{self.base_url}{url}"
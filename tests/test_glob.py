@@ -0,0 +1,41 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from backend.tools.glob import _glob_walk
+
+
+class GlobWalkTest(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        for d in ("src/a/d", "src/b", ".hidden"):
+            os.makedirs(os.path.join(self.base, d))
+        for f in ("a.txt", "src/b.txt", "src/a/c.py", ".hidden/h.txt"):
+            open(os.path.join(self.base, f), "w").close()
+
+    def tearDown(self):
+        shutil.rmtree(self.base)
+
+    def _walk(self, pattern):
+        return [path for path, _, _ in _glob_walk(self.base, pattern, show_hidden=True)]
+
+    def _expected(self, pattern):
+        return sorted(str(p) for p in Path(self.base).glob(pattern))
+
+    def test_matches_path_glob(self):
+        for pattern in ("*", "*.txt", "**/*.py", "src/*", "**", "src/**", ".hidden/*"):
+            with self.subTest(pattern=pattern):
+                self.assertEqual(self._walk(pattern), self._expected(pattern))
+
+    def test_trailing_separator_matches_directories_only(self):
+        for pattern in ("*/", "src/*/", "**/", "src/**/"):
+            with self.subTest(pattern=pattern):
+                got = self._walk(pattern)
+                self.assertEqual(got, self._expected(pattern))
+                self.assertTrue(all(os.path.isdir(p) for p in got))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import re
+import tempfile
+import unittest
+
+from backend.tools.grep import GrepTool
+
+
+def _per_line(text, regex):
+    """Reference result: the original line-by-line search."""
+    return [(n, line) for n, line in enumerate(text.splitlines(), start=1) if regex.search(line)]
+
+
+class SearchFileTest(unittest.TestCase):
+    def _search(self, text, pattern):
+        regex = re.compile(pattern)
+        fd, path = tempfile.mkstemp(suffix=".txt")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+            return GrepTool()._search_file(path, regex), _per_line(text, regex)
+        finally:
+            os.remove(path)
+
+    def test_possessive_and_atomic_patterns_match_per_line(self):
+        # These constructs can swallow a newline on the whole buffer without
+        # backtracking, so the buffer scan must not be used for them
+        text = "x  \ny\nxx \n"
+        for pattern in (r"x\s*+$", r"x\s++$", r"x\s?+$", r"x\s{0,3}+$", r"x(?>\s*)$"):
+            with self.subTest(pattern=pattern):
+                got, expected = self._search(text, pattern)
+                self.assertEqual(got, expected)
+                self.assertTrue(expected)
+
+    def test_buffer_scan_matches_per_line(self):
+        text = "alpha\n\nbeta gamma\r\nfoo  \ndelta\n"
+        for pattern in (r"a$", r"^$", r"\s*$", r"o\s*", r"^\w+ \w+$", r"beta|delta"):
+            with self.subTest(pattern=pattern):
+                got, expected = self._search(text, pattern)
+                self.assertEqual(got, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
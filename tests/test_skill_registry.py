@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from backend.llm.skill_registry import SkillRegistry
+
+
+class FindBestSkillTest(unittest.TestCase):
+    def setUp(self):
+        self.skills_dir = tempfile.mkdtemp()
+        self._add_skill("pdf-tables", "处理PDF文件并提取其中的表格")
+        self._add_skill("git-helper", "Review git history, commits and branches")
+
+    def tearDown(self):
+        shutil.rmtree(self.skills_dir)
+
+    def _add_skill(self, name, description):
+        path = os.path.join(self.skills_dir, name)
+        os.makedirs(path)
+        with open(os.path.join(path, "SKILL.md"), "w", encoding="utf-8") as f:
+            f.write(f"---\nname: {name}\ndescription: {description}\n---\nDo it.\n")
+
+    def test_whole_token_match(self):
+        registry = SkillRegistry(self.skills_dir)
+        self.assertEqual(registry.find_best_skill("show the git commits").name, "git-helper")
+
+    def test_cjk_description_matches_as_substring(self):
+        # The CJK description is a single token; it must still match a query containing it
+        registry = SkillRegistry(self.skills_dir)
+        skill = registry.find_best_skill("请帮我处理pdf文件并提取其中的表格，然后汇总")
+        self.assertIsNotNone(skill)
+        self.assertEqual(skill.name, "pdf-tables")
+
+    def test_english_keyword_inside_longer_query_word(self):
+        registry = SkillRegistry(self.skills_dir)
+        self.assertEqual(registry.find_best_skill("summarize recommits").name, "git-helper")
+
+    def test_no_match(self):
+        registry = SkillRegistry(self.skills_dir)
+        self.assertIsNone(registry.find_best_skill("bake a cake"))
+
+
+if __name__ == "__main__":
+    unittest.main()